@@ -1,13 +1,175 @@
 import os
-import requests
+import time
 import json
+import asyncio
+import threading
+import requests
+import httpx
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, Any, List
+import io
+import wave
 import base64
+import numpy as np
 from dotenv import load_dotenv
+from cache import ResponseCache
+from stt import audio_digest
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Shared by Gemini calls here and Groq question generation in main.py.
+# LLM_CACHE_OPT_OUT lists endpoints ("evaluate", "evaluate_answer", "questions",
+# "transcribe") that should always go upstream, e.g. to keep high-temperature
+# output varied.
+response_cache = ResponseCache(
+    cache_dir=os.getenv("LLM_CACHE_DIR", "/tmp/llm_cache"),
+    max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", 16 * 1024 * 1024)),
+    ttl=float(os.getenv("LLM_CACHE_TTL", 24 * 3600)),
+    max_disk_bytes=int(os.getenv("LLM_CACHE_MAX_DISK_BYTES", 256 * 1024 * 1024)),
+    opt_out=[e.strip() for e in os.getenv("LLM_CACHE_OPT_OUT", "").split(",") if e.strip()]
+)
+
+TRANSCRIBE_ENDPOINT = "models/gemini-2.0-flash:generateContent"
+
+# Audio preprocessing before STT upload
+AUDIO_PREPROCESS = os.getenv("AUDIO_PREPROCESS", "1") == "1"
+STT_SAMPLE_RATE = 16000
+
+# Upper bound on a single rate-limit wait, and on all waits for one call
+MAX_BACKOFF = float(os.getenv("GEMINI_MAX_BACKOFF", 30))
+MAX_RETRY_BUDGET = float(os.getenv("GEMINI_RETRY_BUDGET", 60))
+# Frames quieter than this, relative to the loudest frame, count as silence
+SILENCE_THRESHOLD_DB = float(os.getenv("SILENCE_THRESHOLD_DB", -35))
+VAD_FRAME_SECONDS = 0.02
+VAD_PADDING_SECONDS = 0.15
+
+
+def sniff_audio_format(header: bytes) -> Optional[str]:
+    """Identify an audio container from its first bytes. Returns a MIME type or None."""
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return "audio/wav"
+    if header[:4] == b'\x1aE\xdf\xa3':
+        return "audio/webm"
+    if header[:4] == b'OggS':
+        return "audio/ogg"
+    if header[:4] == b'fLaC':
+        return "audio/flac"
+    if header[:4] == b'FORM' and header[8:12] in (b'AIFF', b'AIFC'):
+        return "audio/aiff"
+    if header[4:8] == b'ftyp':
+        return "audio/mp4"
+    if header[:3] == b'ID3' or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        return "audio/mp3"
+    return None
+
+
+def decode_wav(data: bytes):
+    """Decode PCM WAV into (float32 samples shaped [frames, channels], sample rate)."""
+    with wave.open(io.BytesIO(data)) as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768
+    elif width == 3:
+        # Sign-extend packed 24-bit little-endian samples into int32
+        triplets = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = triplets[:, 0] | (triplets[:, 1] << 8) | (triplets[:, 2] << 16)
+        samples = (np.where(ints & 0x800000, ints - (1 << 24), ints)).astype(np.float32) / (1 << 23)
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype='<i4').astype(np.float32) / (1 << 31)
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width}")
+
+    return samples.reshape(-1, channels), rate
+
+
+def encode_wav(samples, rate: int) -> bytes:
+    """Encode mono float samples as 16-bit PCM WAV."""
+    pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2')
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def trim_silence(samples, rate: int):
+    """Drop leading and trailing silence using frame energy (a simple VAD)."""
+    frame = max(1, int(rate * VAD_FRAME_SECONDS))
+    frames = len(samples) // frame
+    if frames == 0:
+        return samples
+
+    energy = np.sqrt(np.mean(samples[:frames * frame].reshape(frames, frame) ** 2, axis=1))
+    threshold = max(energy.max() * 10 ** (SILENCE_THRESHOLD_DB / 20), 1e-4)
+    voiced = np.flatnonzero(energy >= threshold)
+    if len(voiced) == 0:
+        return samples[:0]
+
+    padding = int(rate * VAD_PADDING_SECONDS)
+    start = max(0, voiced[0] * frame - padding)
+    end = min(len(samples), (voiced[-1] + 1) * frame + padding)
+    return samples[start:end]
+
+
+def resample(samples, rate: int, target_rate: int = STT_SAMPLE_RATE):
+    """
+    Downsample mono audio to target_rate, low-pass filtering first.
+    Audio already at or below target_rate is returned as-is: upsampling
+    would only add bytes, not information.
+    """
+    if rate <= target_rate or len(samples) == 0:
+        return samples
+
+    # Windowed-sinc low-pass at the target Nyquist frequency
+    cutoff = target_rate / rate / 2
+    taps = np.arange(-32, 33)
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * taps) * np.hamming(len(taps))
+    samples = np.convolve(samples, kernel / kernel.sum(), mode='same')
+
+    duration = len(samples) / rate
+    target_times = np.arange(int(duration * target_rate)) / target_rate
+    return np.interp(target_times, np.arange(len(samples)) / rate, samples).astype(np.float32)
+
+
+def preprocess_audio(data: bytes):
+    """
+    Prepare audio for transcription. Returns (bytes, MIME type or None).
+    PCM WAV is downmixed to mono, trimmed of leading and trailing silence
+    and downsampled to 16 kHz; other containers pass through unchanged, as
+    does WAV the stage can't make smaller (e.g. 8-bit audio it would only
+    widen to 16-bit).
+    """
+    mime_type = sniff_audio_format(data[:12])
+    if mime_type != "audio/wav" or not AUDIO_PREPROCESS:
+        return data, mime_type
+
+    try:
+        samples, rate = decode_wav(data)
+    except (wave.Error, ValueError, EOFError) as e:
+        # Compressed or malformed WAV; let the STT service deal with it
+        print(f"Audio preprocessing skipped: {e}")
+        return data, mime_type
+
+    mono = samples.mean(axis=1)
+    trimmed = trim_silence(mono, rate)
+    if samples.shape[1] == 1 and rate <= STT_SAMPLE_RATE and len(trimmed) == len(mono):
+        return data, mime_type
+
+    processed = encode_wav(resample(trimmed, rate), min(rate, STT_SAMPLE_RATE))
+    if len(processed) >= len(data):
+        return data, mime_type
+    return processed, mime_type
+
+
 class AIServiceManager:
     """
     Unified AI service manager for STT, TTS, and evaluation services.
@@ -22,25 +184,83 @@ class AIServiceManager:
         # Environment mode
         self.dev_mode = os.getenv("AI_MODE", "dev").lower() == "dev"
 
-    def _call_gemini_api(self, endpoint: str, payload: Dict[str, Any], max_retries: int = 3) -> Optional[Dict[str, Any]]:
-        """Make a call to Gemini API with exponential backoff."""
-        import time
-        
+        # Pooled HTTP client shared by every Gemini call, so TLS
+        # connections are reused instead of re-established per request
+        self.max_concurrency = int(os.getenv("GEMINI_MAX_CONCURRENCY", 8))
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self._session.mount("https://", adapter)
+        self._sync_limit = threading.BoundedSemaphore(self.max_concurrency)
+
+        # Async client and limiter, bound to the event loop that created them
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_limit: Optional[asyncio.Semaphore] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Audio bytes before and after preprocessing, over every upload
+        self._audio_lock = threading.Lock()
+        self.audio_uploads = 0
+        self.audio_bytes_in = 0
+        self.audio_bytes_out = 0
+
+    def _gemini_url(self, endpoint: str) -> str:
+        return f"{self.gemini_base_url}/{endpoint}?key={self.gemini_api_key}"
+
+    @staticmethod
+    def _backoff_delay(attempt: int, headers) -> float:
+        """
+        Honour Retry-After when present, otherwise back off 2, 4, 8... seconds.
+        Either way the wait is capped at MAX_BACKOFF.
+        """
+        retry_after = headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_BACKOFF)
+        return min((2 ** attempt) * 2, MAX_BACKOFF)
+
+    @staticmethod
+    def _cache_key(endpoint: str, payload: Dict[str, Any]) -> str:
+        return ResponseCache.make_key(endpoint, payload.get("generationConfig"), payload["contents"])
+
+    @staticmethod
+    def _cache_response(cache_as: str, key: str, response: Optional[Dict[str, Any]]):
+        # Only successful generations are worth replaying
+        if response and "candidates" in response:
+            tokens = response.get("usageMetadata", {}).get("totalTokenCount", 0)
+            response_cache.set(cache_as, key, response, tokens)
+
+    def _call_gemini_api(self, endpoint: str, payload: Dict[str, Any], max_retries: int = 3,
+                         cache_as: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Make a call to Gemini API with exponential backoff.
+        With cache_as set, identical requests are answered from response_cache.
+        """
+        if cache_as and response_cache.enabled_for(cache_as):
+            key = self._cache_key(endpoint, payload)
+            cached = response_cache.get(cache_as, key)
+            if cached is not None:
+                return cached
+            response = self._call_gemini_api(endpoint, payload, max_retries)
+            self._cache_response(cache_as, key, response)
+            return response
+
+        waited = 0.0
         for attempt in range(max_retries):
             try:
-                url = f"{self.gemini_base_url}/{endpoint}?key={self.gemini_api_key}"
+                url = self._gemini_url(endpoint)
                 headers = {"Content-Type": "application/json"}
 
-                response = requests.post(url, headers=headers, json=payload, timeout=30)
+                with self._sync_limit:
+                    response = self._session.post(url, headers=headers, json=payload, timeout=30)
                 response.raise_for_status()
 
                 return response.json()
                 
             except requests.exceptions.HTTPError as e:
                 if response.status_code == 429:  # Rate limit
-                    if attempt < max_retries - 1:
-                        wait_time = (2 ** attempt) * 2  # Exponential backoff: 2, 4, 8 seconds
-                        time.sleep(wait_time)
+                    delay = self._backoff_delay(attempt, response.headers)
+                    if attempt < max_retries - 1 and waited + delay <= MAX_RETRY_BUDGET:
+                        time.sleep(delay)
+                        waited += delay
                         continue
                     else:
                         return None
@@ -53,6 +273,80 @@ class AIServiceManager:
         
         return None
 
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Return the pooled async client for the running event loop.
+        A client left over from a previous loop is closed before replacing it.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            if self._async_client is not None:
+                try:
+                    await self._async_client.aclose()
+                except Exception as e:
+                    print(f"Error closing stale async client: {e}")
+            limits = httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+            self._async_client = httpx.AsyncClient(timeout=30, limits=limits)
+            self._async_limit = asyncio.Semaphore(self.max_concurrency)
+            self._async_loop = loop
+        return self._async_client
+
+    async def aclose(self):
+        """Close the async client. Call before the event loop shuts down."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_loop = None
+
+    async def _call_gemini_api_async(self, endpoint: str, payload: Dict[str, Any], max_retries: int = 3,
+                                     cache_as: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Async variant of _call_gemini_api. Backoff waits don't block the event loop."""
+        if cache_as and response_cache.enabled_for(cache_as):
+            key = self._cache_key(endpoint, payload)
+            cached = response_cache.get(cache_as, key)
+            if cached is not None:
+                return cached
+            response = await self._call_gemini_api_async(endpoint, payload, max_retries)
+            self._cache_response(cache_as, key, response)
+            return response
+
+        client = await self._get_async_client()
+        waited = 0.0
+        for attempt in range(max_retries):
+            try:
+                async with self._async_limit:
+                    response = await client.post(
+                        self._gemini_url(endpoint),
+                        headers={"Content-Type": "application/json"},
+                        json=payload
+                    )
+
+                if response.status_code == 429:  # Rate limit
+                    delay = self._backoff_delay(attempt, response.headers)
+                    if attempt < max_retries - 1 and waited + delay <= MAX_RETRY_BUDGET:
+                        await asyncio.sleep(delay)
+                        waited += delay
+                        continue
+                    return None
+
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                print(f"Gemini API error: {e}")
+                return None
+
+        return None
+
+    @staticmethod
+    def _response_text(response: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Pull the first candidate's text out of a Gemini response."""
+        if response and "candidates" in response:
+            return response["candidates"][0]["content"]["parts"][0]["text"]
+        return None
+
     def _call_elevenlabs_api(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
         """Make a call to ElevenLabs API."""
         try:
@@ -64,9 +358,9 @@ class AIServiceManager:
 
             if method == "POST":
                 headers["Content-Type"] = "application/json"
-                response = requests.post(url, headers=headers, json=data, timeout=30)
+                response = self._session.post(url, headers=headers, json=data, timeout=30)
             else:
-                response = requests.get(url, headers=headers, timeout=30)
+                response = self._session.get(url, headers=headers, timeout=30)
 
             response.raise_for_status()
             return response.json()
@@ -74,15 +368,18 @@ class AIServiceManager:
             print(f"ElevenLabs API error: {e}")
             return None
 
-    def transcribe_audio(self, audio_data: bytes, mode: str = "auto") -> Optional[str]:
+    def transcribe_audio(self, audio_data: Optional[bytes] = None, mode: str = "auto",
+                         audio_b64: Optional[str] = None, mime_type: Optional[str] = None) -> Optional[str]:
         """
         Transcribe audio to text.
+        Pass raw audio_data, or audio_b64 when the client already sent base64,
+        which is forwarded to Gemini as-is instead of being decoded and re-encoded.
         mode: 'dev' for Gemini, 'prod' for future production STT, 'auto' for environment-based
         """
         use_dev = (mode == "dev") or (mode == "auto" and self.dev_mode)
 
         if use_dev:
-            result = self._transcribe_with_gemini(audio_data)
+            result = self._transcribe_with_gemini(audio_data, audio_b64, mime_type)
             if result:
                 return result
             else:
@@ -91,230 +388,364 @@ class AIServiceManager:
         else:
             # For MVP, fall back to Gemini even in prod mode
             # In full implementation, this would use a production STT service
-            result = self._transcribe_with_gemini(audio_data)
+            result = self._transcribe_with_gemini(audio_data, audio_b64, mime_type)
             if result:
                 return result
             else:
                 return None
 
-    def _transcribe_with_gemini(self, audio_data: bytes) -> Optional[str]:
-        """Transcribe audio using Gemini 2.5 Flash."""
-        try:
+    @staticmethod
+    def _b64_size(audio_b64: str) -> int:
+        """Decoded size of a base64 string, without decoding it."""
+        return len(audio_b64) * 3 // 4 - audio_b64[-2:].count('=')
+
+    def _count_audio(self, bytes_in: int, bytes_out: int):
+        with self._audio_lock:
+            self.audio_uploads += 1
+            self.audio_bytes_in += bytes_in
+            self.audio_bytes_out += bytes_out
+
+    def audio_stats(self) -> Dict[str, int]:
+        with self._audio_lock:
+            return {
+                "uploads": self.audio_uploads,
+                "audio_bytes_in": self.audio_bytes_in,
+                "audio_bytes_out": self.audio_bytes_out
+            }
+
+    def _transcription_payload(self, audio_data: Optional[bytes] = None, audio_b64: Optional[str] = None,
+                               mime_type: Optional[str] = None) -> Dict[str, Any]:
+        if audio_b64 is not None:
+            # 16 base64 characters decode to the 12 bytes sniffing needs
+            sniffed = sniff_audio_format(base64.b64decode(audio_b64[:16]))
+            if sniffed == "audio/wav" and AUDIO_PREPROCESS:
+                # Raw PCM is worth decoding: trimming and downsampling shrink it a lot
+                audio_data, audio_b64 = base64.b64decode(audio_b64), None
+            else:
+                mime_type = sniffed or mime_type
+                # Forwarded as-is, so it goes out the size it came in
+                size = self._b64_size(audio_b64)
+                self._count_audio(size, size)
+
+        if audio_b64 is None:
+            bytes_in = len(audio_data)
+            audio_data, sniffed = preprocess_audio(audio_data)
+            mime_type = sniffed or mime_type
             # Convert audio to base64
             audio_b64 = base64.b64encode(audio_data).decode('utf-8')
+            self._count_audio(bytes_in, len(audio_data))
 
-            # For simplicity, assume WAV format and basic transcription
-            # In production, you'd want proper audio format detection
-            prompt = """
+        # Without a known type, assume WAV
+        prompt = """
             Transcribe the following audio. Provide only the transcription text, no additional commentary.
             If the audio is unclear or empty, return an empty string.
             """
 
-            payload = {
-                "contents": [{
-                    "parts": [
-                        {"text": prompt},
-                        {
-                            "inline_data": {
-                                "mime_type": "audio/wav",
-                                "data": audio_b64
-                            }
+        return {
+            "contents": [{
+                "parts": [
+                    {"text": prompt},
+                    {
+                        "inline_data": {
+                            "mime_type": mime_type or "audio/wav",
+                            "data": audio_b64
                         }
-                    ]
-                }],
-                "generationConfig": {
-                    "temperature": 0,
-                    "topK": 1,
-                    "topP": 1,
-                    "maxOutputTokens": 2048,
-                }
+                    }
+                ]
+            }],
+            "generationConfig": {
+                "temperature": 0,
+                "topK": 1,
+                "topP": 1,
+                "maxOutputTokens": 2048,
             }
+        }
 
-            response = self._call_gemini_api("models/gemini-2.0-flash:generateContent", payload)
+    def _transcribe_with_gemini(self, audio_data: Optional[bytes] = None, audio_b64: Optional[str] = None,
+                                mime_type: Optional[str] = None) -> Optional[str]:
+        """Transcribe audio using Gemini 2.5 Flash."""
+        try:
+            # Retried uploads of the same clip are answered from the cache
+            key = None
+            if response_cache.enabled_for("transcribe"):
+                key = ResponseCache.make_key(TRANSCRIBE_ENDPOINT, None, audio_digest(audio_data, audio_b64))
+                cached = response_cache.get("transcribe", key)
+                if cached is not None:
+                    return cached
+
+            payload = self._transcription_payload(audio_data, audio_b64, mime_type)
+            response = self._call_gemini_api(TRANSCRIBE_ENDPOINT, payload)
+
+            text = self._response_text(response)
+            if text is None:
+                return None
+            text = text.strip()
+            if text and key is not None:
+                tokens = response.get("usageMetadata", {}).get("totalTokenCount", 0)
+                response_cache.set("transcribe", key, text, tokens)
+            return text
 
-            if response and "candidates" in response:
-                text = response["candidates"][0]["content"]["parts"][0]["text"]
-                return text.strip()
+        except Exception as e:
+            print(f"Gemini transcription error: {e}")
             return None
 
+    async def transcribe_audio_async(self, audio_data: Optional[bytes] = None, audio_b64: Optional[str] = None,
+                                     mime_type: Optional[str] = None) -> Optional[str]:
+        """Async variant of transcribe_audio, always using Gemini."""
+        try:
+            payload = self._transcription_payload(audio_data, audio_b64, mime_type)
+            response = await self._call_gemini_api_async(TRANSCRIBE_ENDPOINT, payload)
+
+            text = self._response_text(response)
+            return text.strip() if text is not None else None
+
         except Exception as e:
             print(f"Gemini transcription error: {e}")
             return None
 
-    def evaluate_interview(self, questions_answers: List[Dict[str, Any]], job_title: str) -> Optional[Dict[str, Any]]:
+    def _evaluation_payload(self, questions_answers: List[Dict[str, Any]], job_title: str) -> Dict[str, Any]:
+        # Format the interview data for evaluation
+        interview_text = f"Job Title: {job_title}\n\n"
+        for i, qa in enumerate(questions_answers, 1):
+            interview_text += f"Q{i}: {qa['question']}\n"
+            interview_text += f"A{i}: {qa['answer']}\n\n"
+
+        prompt = f"""
+        Evaluate this job interview for the position of {job_title}. Analyze the candidate's responses and provide:
+
+        IMPORTANT: These answers were transcribed from speech using browser-based speech recognition.
+        Be context-aware and intelligent about potential transcription errors:
+
+        **Context-Aware Correction Guidelines:**
+        - This is a technical job interview - interpret answers through a technical/programming lens
+        - Look for programming languages, frameworks, tools, and technical concepts
+        - Common speech recognition issues in technical contexts:
+          * Homophones: "no/know", "to/two/too", "there/their/they're", "its/it's"
+          * Technical terms: "axe/ask" → "ask", "wreck/tech" → "tech", "ape/API" → "API"
+          * Programming: "sequel/SQL" → "SQL", "jazz/JavaScript" → "JavaScript", "pie/Python" → "Python"
+          * Tools: "get/Git" → "Git", "hub/GitHub" → "GitHub", "slack/Stack" → "Stack"
+        - Use surrounding context and technical knowledge to disambiguate
+        - If a word doesn't make technical sense, consider phonetic alternatives
+        - Technical acronyms and proper nouns should be preserved/corrected appropriately
+
+        **Evaluation Criteria:**
+        1. Overall score (1-10)
+        2. Content score (1-10) - Quality and relevance of answers (accounting for transcription)
+        3. Delivery score (1-10) - Communication clarity and confidence
+        4. Technical score (1-10) - Technical knowledge and accuracy (with intelligent error correction)
+        5. Communication score (1-10) - Professional communication skills
+
+        **Scoring Guidelines:**
+        - Be generous with technical content scores when transcription errors are likely
+        - Focus delivery scores on actual communication quality, not transcription artifacts
+        - Use technical expertise to evaluate whether the intended answer demonstrates competence
+        Provide exactly 2-3 bullet points of constructive feedback.
+
+        Format your response as JSON:
+        {{
+            "overall": <number>,
+            "content": <number>,
+            "delivery": <number>,
+            "technical": <number>,
+            "communication": <number>,
+            "feedback": ["bullet point 1", "bullet point 2", "bullet point 3"]
+        }}
+
+        Interview:
+        {interview_text}
         """
-        Evaluate interview performance using AI.
-        Returns scores and feedback for different dimensions.
-        """
-        try:
-            # Format the interview data for evaluation
-            interview_text = f"Job Title: {job_title}\n\n"
-            for i, qa in enumerate(questions_answers, 1):
-                interview_text += f"Q{i}: {qa['question']}\n"
-                interview_text += f"A{i}: {qa['answer']}\n\n"
-
-            prompt = f"""
-            Evaluate this job interview for the position of {job_title}. Analyze the candidate's responses and provide:
-
-            IMPORTANT: These answers were transcribed from speech using browser-based speech recognition.
-            Be context-aware and intelligent about potential transcription errors:
-
-            **Context-Aware Correction Guidelines:**
-            - This is a technical job interview - interpret answers through a technical/programming lens
-            - Look for programming languages, frameworks, tools, and technical concepts
-            - Common speech recognition issues in technical contexts:
-              * Homophones: "no/know", "to/two/too", "there/their/they're", "its/it's"
-              * Technical terms: "axe/ask" → "ask", "wreck/tech" → "tech", "ape/API" → "API"
-              * Programming: "sequel/SQL" → "SQL", "jazz/JavaScript" → "JavaScript", "pie/Python" → "Python"
-              * Tools: "get/Git" → "Git", "hub/GitHub" → "GitHub", "slack/Stack" → "Stack"
-            - Use surrounding context and technical knowledge to disambiguate
-            - If a word doesn't make technical sense, consider phonetic alternatives
-            - Technical acronyms and proper nouns should be preserved/corrected appropriately
-
-            **Evaluation Criteria:**
-            1. Overall score (1-10)
-            2. Content score (1-10) - Quality and relevance of answers (accounting for transcription)
-            3. Delivery score (1-10) - Communication clarity and confidence
-            4. Technical score (1-10) - Technical knowledge and accuracy (with intelligent error correction)
-            5. Communication score (1-10) - Professional communication skills
-
-            **Scoring Guidelines:**
-            - Be generous with technical content scores when transcription errors are likely
-            - Focus delivery scores on actual communication quality, not transcription artifacts
-            - Use technical expertise to evaluate whether the intended answer demonstrates competence
-            Provide exactly 2-3 bullet points of constructive feedback.
-
-            Format your response as JSON:
-            {{
-                "overall": <number>,
-                "content": <number>,
-                "delivery": <number>,
-                "technical": <number>,
-                "communication": <number>,
-                "feedback": ["bullet point 1", "bullet point 2", "bullet point 3"]
-            }}
-
-            Interview:
-            {interview_text}
-            """
 
-            payload = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }],
-                "generationConfig": {
-                    "temperature": 0.3,
-                    "topK": 1,
-                    "topP": 1,
-                    "maxOutputTokens": 1024,
-                    "response_mime_type": "application/json"
-                }
+        return {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": {
+                "temperature": 0.3,
+                "topK": 1,
+                "topP": 1,
+                "maxOutputTokens": 1024,
+                "response_mime_type": "application/json"
             }
+        }
 
-            response = self._call_gemini_api("models/gemini-2.0-flash:generateContent", payload)
+    def _parse_evaluation(self, response: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        result_text = self._response_text(response)
+        if result_text is None:
+            return None
 
-            if response and "candidates" in response:
-                result_text = response["candidates"][0]["content"]["parts"][0]["text"]
+        # Parse JSON response
+        try:
+            return json.loads(result_text)
+        except json.JSONDecodeError:
+            print(f"Failed to parse evaluation response: {result_text}")
+            return None
 
-                # Parse JSON response
-                try:
-                    result = json.loads(result_text)
-                    return result
-                except json.JSONDecodeError:
-                    print(f"Failed to parse evaluation response: {result_text}")
-                    return None
+    def evaluate_interview(self, questions_answers: List[Dict[str, Any]], job_title: str) -> Optional[Dict[str, Any]]:
+        """
+        Evaluate interview performance using AI.
+        Returns scores and feedback for different dimensions.
+        """
+        try:
+            payload = self._evaluation_payload(questions_answers, job_title)
+            response = self._call_gemini_api("models/gemini-2.0-flash:generateContent", payload, cache_as="evaluate")
+            return self._parse_evaluation(response)
 
+        except Exception as e:
+            print(f"Interview evaluation error: {e}")
             return None
 
+    async def evaluate_interview_async(self, questions_answers: List[Dict[str, Any]], job_title: str) -> Optional[Dict[str, Any]]:
+        """Async variant of evaluate_interview."""
+        try:
+            payload = self._evaluation_payload(questions_answers, job_title)
+            response = await self._call_gemini_api_async("models/gemini-2.0-flash:generateContent", payload, cache_as="evaluate")
+            return self._parse_evaluation(response)
+
         except Exception as e:
             print(f"Interview evaluation error: {e}")
             return None
 
-    def generate_interview_questions(self, resume_text: str, job_title: str, num_questions: int = 5) -> List[str]:
-        """
-        Generate interview questions based on resume and job title.
+    def _answer_evaluation_payload(self, question: str, answer: str, job_title: str) -> Dict[str, Any]:
+        prompt = f"""
+        Evaluate one answer from a job interview for the position of {job_title}.
+
+        The answer was transcribed from speech using browser-based speech recognition.
+        Interpret likely transcription errors (homophones, misheard technical terms)
+        through a technical lens and don't penalise them.
+
+        Score the answer from 1-10 on:
+        1. Overall
+        2. Content - Quality and relevance of the answer
+        3. Delivery - Communication clarity and confidence
+        4. Technical - Technical knowledge and accuracy
+        5. Communication - Professional communication skills
+
+        Give one sentence of constructive feedback about this answer.
+
+        Format your response as JSON:
+        {{
+            "overall": <number>,
+            "content": <number>,
+            "delivery": <number>,
+            "technical": <number>,
+            "communication": <number>,
+            "feedback": "one sentence"
+        }}
+
+        Question: {question}
+        Answer: {answer}
         """
-        try:
-            prompt = f"""
-            Based on the following resume and job title, generate {num_questions} thoughtful interview questions.
 
-            Job Title: {job_title}
+        return {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": {
+                "temperature": 0.3,
+                "topK": 1,
+                "topP": 1,
+                "maxOutputTokens": 256,
+                "response_mime_type": "application/json"
+            }
+        }
 
-            Resume:
-            {resume_text[:2000]}  # Limit resume text to avoid token limits
+    def evaluate_answer(self, question: str, answer: str, job_title: str) -> Optional[Dict[str, Any]]:
+        """
+        Score a single interview answer, so sessions can be scored as answers
+        arrive instead of in one large call at the end.
+        """
+        try:
+            payload = self._answer_evaluation_payload(question, answer, job_title)
+            response = self._call_gemini_api("models/gemini-2.0-flash:generateContent", payload, cache_as="evaluate_answer")
+            return self._parse_evaluation(response)
 
-            Generate {num_questions} interview questions that:
-            1. Are relevant to the job title and candidate's experience
-            2. Test both technical skills and behavioral competencies
-            3. Progress from general to specific
-            4. Include a mix of situational and technical questions
+        except Exception as e:
+            print(f"Answer evaluation error: {e}")
+            return None
 
-            Return only the questions as a JSON array of strings, no additional text.
-            Example: ["Question 1?", "Question 2?", "Question 3?"]
-            """
+    @staticmethod
+    def _fallback_questions(job_title: str, num_questions: int) -> List[str]:
+        return [
+            f"Can you tell me about your experience with {job_title}?",
+            "What are your greatest strengths and weaknesses?",
+            "Where do you see yourself in 5 years?",
+            "Why are you interested in this position?",
+            f"What technical skills do you have that are relevant to {job_title}?"
+        ][:num_questions]
+
+    def _questions_payload(self, resume_text: str, job_title: str, num_questions: int) -> Dict[str, Any]:
+        prompt = f"""
+        Based on the following resume and job title, generate {num_questions} thoughtful interview questions.
+
+        Job Title: {job_title}
+
+        Resume:
+        {resume_text[:2000]}  # Limit resume text to avoid token limits
+
+        Generate {num_questions} interview questions that:
+        1. Are relevant to the job title and candidate's experience
+        2. Test both technical skills and behavioral competencies
+        3. Progress from general to specific
+        4. Include a mix of situational and technical questions
+
+        Return only the questions as a JSON array of strings, no additional text.
+        Example: ["Question 1?", "Question 2?", "Question 3?"]
+        """
 
-            payload = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }],
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 1024,
-                    "response_mime_type": "application/json"
-                }
+        return {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": {
+                "temperature": 0.7,
+                "topK": 40,
+                "topP": 0.95,
+                "maxOutputTokens": 1024,
+                "response_mime_type": "application/json"
             }
+        }
 
-            response = self._call_gemini_api("models/gemini-2.0-flash:generateContent", payload)
-
-            if response and "candidates" in response:
-                result_text = response["candidates"][0]["content"]["parts"][0]["text"]
+    def _parse_questions(self, response: Optional[Dict[str, Any]], job_title: str, num_questions: int) -> List[str]:
+        result_text = self._response_text(response)
+        if result_text is None:
+            # Return fallback questions if API fails
+            return self._fallback_questions(job_title, num_questions)
 
-                # Parse JSON response
-                try:
-                    questions = json.loads(result_text)
-                    if isinstance(questions, list) and len(questions) > 0:
-                        return questions[:num_questions]  # Ensure we don't exceed requested number
-                    else:
-                        # Fallback questions if parsing fails
-                        return [
-                            f"Can you tell me about your experience with {job_title}?",
-                            "What are your greatest strengths and weaknesses?",
-                            "Where do you see yourself in 5 years?",
-                            "Why are you interested in this position?",
-                            f"What technical skills do you have that are relevant to {job_title}?"
-                        ][:num_questions]
-                except json.JSONDecodeError:
-                    print(f"Failed to parse questions response: {result_text}")
-                    # Return fallback questions
-                    return [
-                        f"Can you tell me about your experience with {job_title}?",
-                        "What are your greatest strengths and weaknesses?",
-                        "Where do you see yourself in 5 years?",
-                        "Why are you interested in this position?",
-                        f"What technical skills do you have that are relevant to {job_title}?"
-                    ][:num_questions]
+        # Parse JSON response
+        try:
+            questions = json.loads(result_text)
+            if isinstance(questions, list) and len(questions) > 0:
+                return questions[:num_questions]  # Ensure we don't exceed requested number
+            # Fallback questions if parsing fails
+            return self._fallback_questions(job_title, num_questions)
+        except json.JSONDecodeError:
+            print(f"Failed to parse questions response: {result_text}")
+            return self._fallback_questions(job_title, num_questions)
 
-            # Return fallback questions if API fails
-            return [
-                f"Can you tell me about your experience with {job_title}?",
-                "What are your greatest strengths and weaknesses?",
-                "Where do you see yourself in 5 years?",
-                "Why are you interested in this position?",
-                f"What technical skills do you have that are relevant to {job_title}?"
-            ][:num_questions]
+    def generate_interview_questions(self, resume_text: str, job_title: str, num_questions: int = 5) -> List[str]:
+        """
+        Generate interview questions based on resume and job title.
+        """
+        try:
+            payload = self._questions_payload(resume_text, job_title, num_questions)
+            response = self._call_gemini_api("models/gemini-2.0-flash:generateContent", payload, cache_as="questions")
+            return self._parse_questions(response, job_title, num_questions)
 
         except Exception as e:
             print(f"Question generation error: {e}")
             # Return basic fallback questions
-            return [
-                f"Can you tell me about your experience with {job_title}?",
-                "What are your greatest strengths and weaknesses?",
-                "Where do you see yourself in 5 years?",
-                "Why are you interested in this position?",
-                f"What technical skills do you have that are relevant to {job_title}?"
-            ][:num_questions]
+            return self._fallback_questions(job_title, num_questions)
+
+    async def generate_interview_questions_async(self, resume_text: str, job_title: str, num_questions: int = 5) -> List[str]:
+        """Async variant of generate_interview_questions."""
+        try:
+            payload = self._questions_payload(resume_text, job_title, num_questions)
+            response = await self._call_gemini_api_async("models/gemini-2.0-flash:generateContent", payload, cache_as="questions")
+            return self._parse_questions(response, job_title, num_questions)
+
+        except Exception as e:
+            print(f"Question generation error: {e}")
+            return self._fallback_questions(job_title, num_questions)
 
 # Global AI service instance
 ai_service = AIServiceManager()
\ No newline at end of file
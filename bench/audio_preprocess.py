@@ -0,0 +1,81 @@
+"""
+Audio preprocessing benchmark: bytes sent to the STT service before and after
+the preprocessing stage, and the time it takes, over synthetic sample clips.
+
+    python bench/audio_preprocess.py
+"""
+import io
+import time
+import wave
+import argparse
+
+import numpy as np
+
+from common import isolated_data_dir
+
+
+def speech_like(seconds, rate, rng):
+    """Amplitude-modulated harmonics, loud enough to pass the energy VAD."""
+    t = np.arange(int(seconds * rate)) / rate
+    voice = sum(np.sin(2 * np.pi * f * t) / i for i, f in enumerate((180, 360, 720, 1400), 1))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    return 0.2 * voice * envelope + 0.005 * rng.standard_normal(len(t))
+
+
+def make_wav(rate, channels, lead, speech, tail, width=2, seed=0):
+    rng = np.random.default_rng(seed)
+    mono = np.concatenate([
+        0.001 * rng.standard_normal(int(lead * rate)),
+        speech_like(speech, rate, rng),
+        0.001 * rng.standard_normal(int(tail * rate)),
+    ])
+    frames = np.repeat(mono[:, None], channels, axis=1)
+    if width == 1:
+        pcm = (np.clip(frames, -1, 1) * 127 + 128).astype(np.uint8)
+    else:
+        scale = {2: 32767, 4: 2 ** 31 - 1}[width]
+        pcm = (np.clip(frames, -1, 1) * scale).astype({2: '<i2', 4: '<i4'}[width])
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(width)
+        wav.setframerate(rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+CLIPS = {
+    "48k stereo, 2s silence each end": lambda: make_wav(48000, 2, 2.0, 6.0, 2.0),
+    "44.1k mono, 1s lead-in": lambda: make_wav(44100, 1, 1.0, 8.0, 0.2),
+    "48k stereo 32-bit, answer": lambda: make_wav(48000, 2, 0.5, 20.0, 1.5, width=4),
+    "16k mono, already compact": lambda: make_wav(16000, 1, 0.1, 10.0, 0.1),
+    "8k mono 8-bit telephone": lambda: make_wav(8000, 1, 0.3, 10.0, 0.3, width=1),
+    "webm (passed through)": lambda: b'\x1aE\xdf\xa3' + bytes(200_000),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.parse_args()
+
+    isolated_data_dir()
+    from ai_service import AIServiceManager
+
+    manager = AIServiceManager()
+    total_in = total_out = 0
+    for name, build in CLIPS.items():
+        clip = build()
+        started = time.perf_counter()
+        payload = manager._transcription_payload(audio_data=clip)
+        elapsed = (time.perf_counter() - started) * 1000
+        sent = len(payload["contents"][0]["parts"][1]["inline_data"]["data"]) * 3 // 4
+        total_in += len(clip)
+        total_out += sent
+        print(f"{name:<34} {len(clip) / 1024:9.0f} KiB -> {sent / 1024:8.0f} KiB "
+              f"({sent / len(clip):6.1%})  {elapsed:7.1f} ms")
+    print(f"{'total':<34} {total_in / 1024:9.0f} KiB -> {total_out / 1024:8.0f} KiB ({total_out / total_in:6.1%})")
+    print(f"counters: {manager.audio_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Auth microbenchmark: per-request cost of token_required's work, with a full
+jwt.decode and user-log check every time (before) against the verified-token
+cache and throttled user refresh (after).
+
+    python bench/auth_overhead.py --requests 20000 --users 10000
+"""
+import json
+import uuid
+import argparse
+import datetime
+
+from common import isolated_data_dir, report, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=10000)
+    args = parser.parse_args()
+
+    isolated_data_dir()
+    import jwt
+    import main as app_module
+    from cache import TokenCache
+    from storage import UserStore
+
+    # A populated user log, like a deployed instance's
+    log_path = app_module.user_store.log_path
+    user_ids = [str(uuid.uuid4()) for _ in range(args.users)]
+    with open(log_path, "a", encoding="utf-8") as f:
+        for i, user_id in enumerate(user_ids):
+            f.write(json.dumps({"id": user_id, "name": f"User {i}", "email": f"user{i}@example.com",
+                                "password": "x", "created_at": "2024-01-01T00:00:00+00:00"}) + "\n")
+    users = UserStore(log_path)
+
+    exp = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=7)
+    tokens = [jwt.encode({"user_id": user_id, "exp": exp}, app_module.JWT_SECRET_KEY, algorithm="HS256")
+              for user_id in user_ids[:100]]
+
+    before, after = [], []
+    for i in range(args.requests):
+        with timed(before):
+            claims = app_module.decode_token(tokens[i % len(tokens)])
+            users.get_by_id(claims["user_id"])
+
+    token_cache = TokenCache(max_bytes=4 * 1024 * 1024)
+    for i in range(args.requests):
+        with timed(after):
+            claims = token_cache.verify(tokens[i % len(tokens)], app_module.decode_token)
+            users.get_by_id(claims["user_id"], max_age=app_module.USER_REFRESH_SECONDS)
+
+    report("decode + log check (before)", before, unit="us")
+    report("cached token + throttled (after)", after, unit="us")
+    stats = token_cache.stats()
+    print(f"token cache hit rate {stats['hits'] / args.requests:.1%}, "
+          f"avg verify {stats['avg_verify_ms']:.3f} ms, saved {stats['seconds_saved']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
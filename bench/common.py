@@ -0,0 +1,82 @@
+"""Shared helpers for the benchmark scripts in this directory."""
+import os
+import sys
+import time
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, List
+
+# Let `python bench/<script>.py` import the backend modules from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def isolated_data_dir() -> str:
+    """
+    Point every on-disk store at a fresh temp directory. Call before
+    importing main/storage: they open their stores at import time, so
+    importing them first would touch the real data paths.
+    """
+    data_dir = tempfile.mkdtemp(prefix="bench_")
+    # Overridden, not defaulted, so a configured production path is never used
+    os.environ["STORAGE_DIR"] = os.path.join(data_dir, "user_data")
+    os.environ["USER_STORE_PATH"] = os.path.join(data_dir, "users.log")
+    os.environ["STORAGE_DB_PATH"] = os.path.join(data_dir, "storage.sqlite3")
+    os.environ["INTERVIEW_INDEX_PATH"] = os.path.join(data_dir, "index.sqlite3")
+    os.environ["LLM_CACHE_DIR"] = os.path.join(data_dir, "llm_cache")
+    os.environ["EMBEDDING_CACHE_DIR"] = os.path.join(data_dir, "embedding_cache")
+    os.environ["STT_SPOOL_DIR"] = os.path.join(data_dir, "stt_streams")
+    return data_dir
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    pick = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": ordered[-1]}
+
+
+def report(name: str, samples: List[float], unit: str = "ms"):
+    """Print one line of latency percentiles; samples are in seconds."""
+    scale = {"s": 1, "ms": 1e3, "us": 1e6}[unit]
+    stats = percentiles(samples)
+    print(f"{name:<32} n={len(samples):<6} " + " ".join(
+        f"{key}={value * scale:9.3f}{unit}" for key, value in stats.items()
+    ))
+
+
+@contextmanager
+def timed(samples: List[float]):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append(time.perf_counter() - started)
+
+
+def interview_document(i: int, questions: int = 8) -> Dict:
+    """A completed interview result shaped like the ones main.py stores."""
+    return {
+        "interview_id": f"interview-{i}",
+        "user_id": f"user-{i % 1000}",
+        "job_title": ("Backend Engineer", "Data Scientist", "Frontend Developer")[i % 3],
+        "status": "completed",
+        "created_at": "2024-05-01T10:00:00+00:00",
+        "completed_at": "2024-05-01T10:30:00+00:00",
+        "questions": [f"Question {q}: describe a project where you scaled a service?" for q in range(questions)],
+        "answers": [{
+            "question_index": q,
+            "question": f"Question {q}: describe a project where you scaled a service?",
+            "answer": "I moved the ingestion path to a queue, sharded the workers and added caching. " * 6,
+            "timestamp": "2024-05-01T10:05:00+00:00",
+            "score": {
+                "overall_score": 7.5, "technical_accuracy": 8, "communication": 7,
+                "problem_solving": 7, "relevance": 8,
+                "feedback": "Clear structure, could quantify the impact more.",
+                "strengths": ["structure", "depth"], "improvements": ["metrics"]
+            }
+        } for q in range(questions)],
+        "overall_score": 7.5,
+    }
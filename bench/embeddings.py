@@ -0,0 +1,72 @@
+"""
+Embedding throughput benchmark in chunks/sec: raw embedder speed, then
+embed_chunks with a cold and a warm on-disk vector cache.
+
+    python bench/embeddings.py --chunks 2000
+    EMBEDDING_MODEL_DIR=models/all-MiniLM-L6-v2 python bench/embeddings.py
+
+The MiniLM rows appear only when its ONNX model and tokenizer are available.
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+
+from common import isolated_data_dir
+
+WORDS = ("python flask qdrant react docker kubernetes postgres latency cache "
+         "vector embedding interview resume backend frontend pipeline").split()
+
+
+def make_chunks(count, size=1000):
+    rng = random.Random(0)
+    chunks = []
+    for i in range(count):
+        text = f"chunk {i} "
+        while len(text) < size:
+            text += rng.choice(WORDS) + " "
+        chunks.append(text[:size])
+    return chunks
+
+
+def throughput(fn, chunks):
+    started = time.perf_counter()
+    fn(chunks)
+    return len(chunks) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chunks", type=int, default=2000)
+    args = parser.parse_args()
+
+    isolated_data_dir()
+    import main as app_module
+
+    class CachedHashEmbedder(app_module.HashEmbedder):
+        name = "hash-cached"
+        cacheable = True
+
+    embedders = [app_module.HashEmbedder(), CachedHashEmbedder()]
+    try:
+        embedders.append(app_module.MiniLMEmbedder(
+            os.getenv("EMBEDDING_MODEL_DIR", "models/all-MiniLM-L6-v2")
+        ))
+    except Exception as e:
+        print(f"MiniLM embedder unavailable, skipping: {e}")
+
+    chunks = make_chunks(args.chunks)
+    for embedder in embedders:
+        app_module.embedder = embedder
+        app_module.embedding_cache = app_module.EmbeddingCache(tempfile.mkdtemp(prefix="bench_vectors_"))
+        print(f"{embedder.name:<12} embed: {throughput(embedder.embed, chunks):10.0f} chunks/s")
+        if embedder.cacheable:
+            cold = throughput(app_module.embed_chunks, chunks)
+            warm = throughput(app_module.embed_chunks, chunks)
+            print(f"{embedder.name:<12} embed_chunks cold cache: {cold:10.0f} chunks/s, "
+                  f"warm cache (re-upload): {warm:10.0f} chunks/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Gemini client benchmark against a local stub server: requests/sec and tail
+latency for a fresh requests.post per call (the old client), the pooled
+session, and the asyncio client.
+
+    python bench/gemini_client.py --requests 500 --concurrency 8 --delay-ms 20
+
+The stub is plain HTTP on loopback, so this understates what pooling saves
+against the real API, where every new connection also pays a TLS handshake.
+"""
+import json
+import time
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common import isolated_data_dir, report, timed
+
+RESPONSE = json.dumps({
+    "candidates": [{"content": {"parts": [{"text": "stub answer"}]}}],
+    "usageMetadata": {"totalTokenCount": 12}
+}).encode()
+
+
+def start_stub(delay, rate_limit_every):
+    """Serve Gemini-shaped responses after `delay` seconds; every Nth call gets a 429."""
+    counter = {"calls": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Send headers and body in one segment; otherwise Nagle plus delayed
+        # ACKs add ~40ms to every keep-alive response and penalise pooling
+        wbufsize = 64 * 1024
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with lock:
+                counter["calls"] += 1
+                limited = rate_limit_every and counter["calls"] % rate_limit_every == 0
+            time.sleep(delay)
+            body = b"{}" if limited else RESPONSE
+            self.send_response(429 if limited else 200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if limited:
+                self.send_header("Retry-After", "0")
+            self.end_headers()
+            self.wfile.write(body)
+
+    class Server(ThreadingHTTPServer):
+        # The default backlog of 5 drops connections under load and adds 1s SYN retries
+        request_queue_size = 128
+
+    server = Server(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_threads(call, count, concurrency):
+    latencies = []
+
+    def one(_):
+        with timed(latencies):
+            call()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(count)))
+    return latencies, time.perf_counter() - started
+
+
+async def run_async(manager, payload, count, concurrency):
+    latencies = []
+    remaining = iter(range(count))
+
+    async def worker():
+        # Same number of callers as the thread runs, so latency excludes queueing
+        for _ in remaining:
+            with timed(latencies):
+                await manager._call_gemini_api_async("models/stub:generateContent", payload)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await manager.aclose()
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="caller threads; the clients themselves allow GEMINI_MAX_CONCURRENCY")
+    parser.add_argument("--delay-ms", type=float, default=20)
+    parser.add_argument("--rate-limit-every", type=int, default=0,
+                        help="answer every Nth request with 429 Retry-After: 0")
+    args = parser.parse_args()
+
+    isolated_data_dir()
+    from ai_service import AIServiceManager
+
+    server = start_stub(args.delay_ms / 1000, args.rate_limit_every)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1beta"
+    payload = {"contents": [{"parts": [{"text": "hello"}]}]}
+
+    manager = AIServiceManager()
+    manager.gemini_base_url = base_url
+    # The stub speaks plain HTTP; give it the same pool the https:// mount has
+    manager._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=manager.max_concurrency))
+
+    def unpooled():
+        requests.post(manager._gemini_url("models/stub:generateContent"), json=payload, timeout=30).json()
+
+    def pooled():
+        manager._call_gemini_api("models/stub:generateContent", payload)
+
+    for name, call in (("requests.post per call", unpooled), ("pooled session", pooled)):
+        latencies, elapsed = run_threads(call, args.requests, args.concurrency)
+        report(name, latencies)
+        print(f"{'':<32} {args.requests / elapsed:.1f} req/s")
+
+    latencies, elapsed = asyncio.run(run_async(manager, payload, args.requests, args.concurrency))
+    report("async client", latencies)
+    print(f"{'':<32} {args.requests / elapsed:.1f} req/s")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
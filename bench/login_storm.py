@@ -0,0 +1,121 @@
+"""
+Login-storm harness: fire many concurrent logins at /api/auth/login while
+other clients keep using the interview endpoints, and report p50/p95/p99 of
+both. Interview traffic is measured once on its own and once during the
+storm, so the effect of password hashing on everyone else is visible.
+
+    python bench/login_storm.py --requests 400 --concurrency 64 --interview-clients 4
+
+Compare runs with different PASSWORD_WORKERS / PASSWORD_MAX_PENDING /
+PASSWORD_HASH_METHOD settings to size the password pool.
+"""
+import argparse
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from common import isolated_data_dir, report, timed
+
+QUESTIONS = [f"Question {i}: tell me about a system you built?" for i in range(200)]
+
+
+def register(client, email, name):
+    password = "correct horse"
+    response = client.post("/api/auth/register", json={
+        "email": email, "password": password, "name": name, "confirmPassword": password
+    })
+    if response.status_code == 409:
+        response = client.post("/api/auth/login", json={"email": email, "password": password})
+    assert response.status_code in (200, 201), response.get_json()
+    return {"email": email, "password": password}, {"Authorization": f"Bearer {response.get_json()['token']}"}
+
+
+def interview_client(app, headers, stop, status_latencies, answer_latencies):
+    """Poll status and submit answers until stop is set, starting new interviews as needed."""
+    client = app.test_client()
+    session_id, remaining = None, 0
+    while not stop.is_set():
+        if not remaining:
+            response = client.post("/api/interview/start", headers=headers,
+                                   json={"job_title": "Backend Engineer", "questions": QUESTIONS})
+            session_id, remaining = response.get_json()["session_id"], len(QUESTIONS)
+        with timed(status_latencies):
+            client.get(f"/api/interview/{session_id}/status", headers=headers)
+        with timed(answer_latencies):
+            client.post(f"/api/interview/{session_id}/answer", headers=headers,
+                        json={"answer": "I split the ingest path onto a queue and added caching."})
+        remaining -= 1
+
+
+def run_interview_traffic(app, clients, during):
+    """Run interview clients for the duration of during(); return their latencies."""
+    stop = threading.Event()
+    status_latencies, answer_latencies = [], []
+    threads = [
+        threading.Thread(target=interview_client,
+                         args=(app, headers, stop, status_latencies, answer_latencies))
+        for headers in clients
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        during()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return status_latencies, answer_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--interview-clients", type=int, default=4)
+    parser.add_argument("--baseline-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    isolated_data_dir()
+    import main as app_module
+    from passwords import password_hasher
+
+    # Answer scoring would otherwise call Gemini
+    app_module.ai_service.evaluate_answer = lambda question, answer, job_title: {
+        "overall": 7, "content": 7, "delivery": 7, "technical": 7, "communication": 7, "feedback": "ok"
+    }
+
+    client = app_module.app.test_client()
+    credentials, _ = register(client, "storm@example.com", "Storm")
+    clients = [register(client, f"candidate{i}@example.com", f"Candidate {i}")[1]
+               for i in range(args.interview_clients)]
+
+    baseline = run_interview_traffic(app_module.app, clients, lambda: time.sleep(args.baseline_seconds))
+
+    login_latencies, statuses = [], Counter()
+
+    def login(_):
+        with timed(login_latencies):
+            status = app_module.app.test_client().post("/api/auth/login", json=credentials).status_code
+        statuses[status] += 1
+
+    elapsed = []
+
+    def storm():
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(login, range(args.requests)))
+        elapsed.append(time.perf_counter() - started)
+
+    during = run_interview_traffic(app_module.app, clients, storm)
+
+    report(f"login x{args.concurrency} concurrent", login_latencies)
+    print(f"throughput: {args.requests / elapsed[0]:.1f} req/s, statuses: {dict(statuses)}")
+    for label, (status_latencies, answer_latencies) in (("no storm", baseline), ("during storm", during)):
+        report(f"status ({label})", status_latencies)
+        report(f"answer ({label})", answer_latencies)
+    print(f"password pool: {password_hasher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+PDF extraction benchmark over a synthetic corpus: pages/sec and peak RSS for
+the streaming extractor against the old read-everything, `text +=` version.
+Each run happens in a fresh process so its peak RSS is its own.
+
+    python bench/pdf_extract.py --pages 1 10 50 200
+"""
+import io
+import time
+import argparse
+import resource
+import multiprocessing
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+
+LINE = "Senior engineer building Python services, vector search and streaming APIs at scale."
+
+
+def make_pdf(pages, lines_per_page=50):
+    """Build an uncompressed multi-page PDF with Helvetica text on every page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        content = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(
+            f"(Page {page} line {line}: {LINE}) '" for line in range(lines_per_page)
+        ) + " ET"
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+    return out.getvalue()
+
+
+def legacy_extract(stream):
+    """The extractor before the rewrite: whole upload into BytesIO, then text +=."""
+    from PyPDF2 import PdfReader
+    reader = PdfReader(io.BytesIO(stream.read()))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text()
+    return text
+
+
+def run(variant, pdf, pages):
+    import main as app_module
+
+    def streaming_extract(stream):
+        # Limits are lifted to the document's size so large corpora can be measured
+        return "".join(app_module.iter_pdf_pages(stream, max_pages=pages, max_bytes=len(pdf)))
+
+    extract = legacy_extract if variant == "legacy" else streaming_extract
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    text = extract(io.BytesIO(pdf))
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pages / elapsed, (peak - baseline) / 1024, len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    common.isolated_data_dir()
+    context = multiprocessing.get_context("spawn")
+    for pages in args.pages:
+        pdf = make_pdf(pages)
+        print(f"\n{pages} pages, {len(pdf) / 1024:.0f} KiB")
+        for variant in ("legacy", "streaming"):
+            with context.Pool(1) as pool:
+                rate, rss_mib, chars = pool.apply(run, (variant, pdf, pages))
+            print(f"  {variant:<10} {rate:8.1f} pages/s  peak RSS +{rss_mib:6.1f} MiB  {chars} chars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Serializer benchmark: encode/decode time and bytes on disk per storage
+format, for realistic interview documents. Includes the old stdlib
+json.dump(indent=2) path as the baseline.
+
+    python bench/serializers.py --documents 2000
+"""
+import json
+import time
+import argparse
+
+from common import interview_document, isolated_data_dir
+
+
+class StdlibPrettyJSON:
+    """What storage.py did before the serializer layer."""
+
+    def dumps(self, data):
+        return json.dumps(data, indent=2).encode('utf-8')
+
+    def loads(self, raw):
+        return json.loads(raw)
+
+
+def measure(serializer, documents):
+    started = time.perf_counter()
+    encoded = [serializer.dumps(doc) for doc in documents]
+    encode = time.perf_counter() - started
+    started = time.perf_counter()
+    for raw in encoded:
+        serializer.loads(raw)
+    decode = time.perf_counter() - started
+    return encode, decode, sum(len(raw) for raw in encoded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=2000)
+    args = parser.parse_args()
+
+    isolated_data_dir()
+    import storage
+
+    documents = [interview_document(i) for i in range(args.documents)]
+    print(f"orjson: {'yes' if storage.orjson else 'no'}, msgpack: {'yes' if storage.msgpack else 'no'}")
+    print(f"{'format':<22} {'encode us/doc':>14} {'decode us/doc':>14} {'bytes/doc':>10}")
+
+    formats = [("stdlib json indent=2", StdlibPrettyJSON())]
+    formats += [(name, storage.get_serializer(name)) for name in storage.SERIALIZERS]
+    for name, serializer in formats:
+        encode, decode, size = measure(serializer, documents)
+        print(f"{name:<22} {encode / len(documents) * 1e6:>14.1f} "
+              f"{decode / len(documents) * 1e6:>14.1f} {size / len(documents):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
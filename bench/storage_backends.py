@@ -0,0 +1,67 @@
+"""
+Storage backend benchmark: the file backend against SQLite at scale.
+Writes `--records` interview results spread over `--users` users, then
+times history listing, document loads and the on-disk footprint.
+
+    python bench/storage_backends.py --records 100000 --users 1000
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+
+from common import interview_document, isolated_data_dir, report, timed
+
+
+def footprint(path):
+    files = size = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(root, name))
+    return files, size
+
+
+def run(name, storage, data_dir, records, users, samples):
+    started = time.perf_counter()
+    for i in range(records):
+        storage.save_user_data(f"user-{i % users}", f"result_{i}.json", interview_document(i, questions=4))
+    elapsed = time.perf_counter() - started
+    print(f"\n{name}: {records / elapsed:.0f} writes/s")
+
+    rng = random.Random(0)
+    listed, loaded = [], []
+    for _ in range(samples):
+        user_id = f"user-{rng.randrange(users)}"
+        with timed(listed):
+            files = storage.list_user_files(user_id)
+        with timed(loaded):
+            storage.load_user_data(user_id, rng.choice(files))
+    report("list_user_files", listed)
+    report("load_user_data", loaded)
+
+    files, size = footprint(data_dir)
+    print(f"on disk: {files} files, {size / 1024 / 1024:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=1000)
+    args = parser.parse_args()
+
+    isolated_data_dir()
+    from storage import SimpleStorage, SQLiteStorage
+
+    file_dir = tempfile.mkdtemp(prefix="bench_files_")
+    run("file", SimpleStorage(file_dir, serializer="json"), file_dir, args.records, args.users, args.samples)
+
+    sqlite_dir = tempfile.mkdtemp(prefix="bench_sqlite_")
+    sqlite = SQLiteStorage(os.path.join(sqlite_dir, "storage.sqlite3"), serializer="json")
+    run("sqlite", sqlite, sqlite_dir, args.records, args.users, args.samples)
+
+
+if __name__ == "__main__":
+    main()
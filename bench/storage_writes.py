@@ -0,0 +1,46 @@
+"""
+Storage write-concurrency benchmark: writes/sec as the number of writer
+threads grows, with striped per-user locks against a single global lock.
+
+    python bench/storage_writes.py --threads 1 2 4 8 16 --writes 200
+"""
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from common import interview_document, isolated_data_dir
+
+
+def writes_per_second(storage, threads, writes):
+    def writer(thread):
+        for i in range(writes):
+            doc_id = thread * writes + i
+            storage.save_user_data(f"user-{doc_id % 500}", f"result_{doc_id}.json", interview_document(doc_id))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(writer, range(threads)))
+    return threads * writes / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--writes", type=int, default=200, help="writes per thread")
+    args = parser.parse_args()
+
+    isolated_data_dir()
+    from storage import SimpleStorage
+
+    print(f"{'threads':>7} {'striped locks':>16} {'single lock':>16}")
+    for threads in args.threads:
+        striped = writes_per_second(SimpleStorage(tempfile.mkdtemp(prefix="bench_store_")), threads, args.writes)
+        single = writes_per_second(
+            SimpleStorage(tempfile.mkdtemp(prefix="bench_store_"), lock_stripes=1), threads, args.writes
+        )
+        print(f"{threads:>7} {striped:>11.0f} w/s {single:>11.0f} w/s")
+
+
+if __name__ == "__main__":
+    main()
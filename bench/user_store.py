@@ -0,0 +1,58 @@
+"""
+User-store benchmark: email lookup latency as the account count grows, against
+the old linear scan over every user, plus the cost of replaying the log at startup.
+
+    python bench/user_store.py --sizes 1000 10000 100000 1000000
+"""
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+
+from common import isolated_data_dir, report, timed
+
+
+def write_log(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({
+                "id": f"user-{i}", "name": f"User {i}", "email": f"user{i}@example.com",
+                "password": "scrypt:32768:8:1$salt$hash", "created_at": "2024-01-01T00:00:00+00:00"
+            }) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    isolated_data_dir()
+    from storage import UserStore
+
+    for count in args.sizes:
+        path = os.path.join(tempfile.mkdtemp(prefix="bench_users_"), "users.log")
+        write_log(path, count)
+
+        started = time.perf_counter()
+        store = UserStore(path)
+        print(f"\n{count} users: log replay {time.perf_counter() - started:.2f}s")
+
+        emails = [f"user{random.randrange(count)}@example.com" for _ in range(args.lookups)]
+        indexed, scanned = [], []
+        for email in emails:
+            with timed(indexed):
+                store.get_by_email(email)
+        users = list(store._users.values())
+        for email in emails[:max(1, args.lookups // 10)]:
+            with timed(scanned):
+                next(u for u in users if u["email"] == email)
+
+        report("get_by_email (indexed)", indexed)
+        report("linear scan (before)", scanned)
+
+
+if __name__ == "__main__":
+    main()
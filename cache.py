@@ -0,0 +1,280 @@
+import os
+import sys
+import json
+import time
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by the total size of its entries in bytes.
+    Entries older than ttl seconds are treated as misses.
+    """
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = None,
+                 sizeof: Callable[[Any], int] = sys.getsizeof):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, _, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                self._remove(key)
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, size: Optional[int] = None):
+        """Store value. size overrides sizeof(value) when the caller already knows it."""
+        if size is None:
+            size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            # Values larger than the whole cache are never stored
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes
+            }
+
+
+class ResponseCache:
+    """
+    Content-addressed cache for LLM responses.
+    Keys hash the model, generation config and prompt, so only identical
+    requests share an entry. An in-memory LRU sits in front of an on-disk
+    tier that is shared by every worker process. Endpoints listed in
+    opt_out (e.g. high-temperature calls where variety matters) are never
+    cached.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, ttl: Optional[float] = None,
+                 opt_out: Iterable[str] = (), max_disk_bytes: int = 256 * 1024 * 1024,
+                 prune_every: int = 100):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.opt_out = set(opt_out)
+        self.max_disk_bytes = max_disk_bytes
+        self.prune_every = prune_every
+        # Entries are sized by their serialized length, passed to set()
+        self.memory = LRUCache(max_bytes)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.upstream_calls: Dict[str, int] = defaultdict(int)
+        self.saved_calls: Dict[str, int] = defaultdict(int)
+        self.saved_tokens: Dict[str, int] = defaultdict(int)
+        self.disk_evictions = 0
+
+    @staticmethod
+    def make_key(model: str, config: Any, prompt: Any) -> str:
+        material = json.dumps([model, config, prompt], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def enabled_for(self, endpoint: str) -> bool:
+        return endpoint not in self.opt_out
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return self.ttl is not None and time.time() - entry["stored_at"] > self.ttl
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.memory.get(key)
+        if entry is not None:
+            return entry
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            entry = json.loads(raw)
+            # The disk tier is pruned least recently used first
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        self.memory.set(key, entry, size=len(raw))
+        return entry
+
+    def _remove(self, key: str):
+        self.memory.delete(key)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, endpoint: str, key: str) -> Any:
+        """Return the cached response, or None. Hits count as saved upstream calls."""
+        entry = self._load(key)
+        if entry is None:
+            return None
+        if self._expired(entry):
+            self._remove(key)
+            return None
+        with self._lock:
+            self.saved_calls[endpoint] += 1
+            self.saved_tokens[endpoint] += entry.get("tokens", 0)
+        return entry["value"]
+
+    def set(self, endpoint: str, key: str, value: Any, tokens: int = 0):
+        """Store a fresh upstream response and count the upstream call."""
+        with self._lock:
+            self.upstream_calls[endpoint] += 1
+            self._writes += 1
+            prune = self._writes % self.prune_every == 0
+        entry = {"value": value, "tokens": tokens, "stored_at": time.time()}
+        raw = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        self.memory.set(key, entry, size=len(raw))
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing response cache: {e}")
+
+        if prune:
+            self.prune_disk()
+
+    def prune_disk(self):
+        """Delete expired files, then the least recently used until the disk tier fits max_disk_bytes."""
+        files = []
+        total = 0
+        now = time.time()
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                # Entries are written once, so mtime is the store time until a hit touches it
+                if self.ttl is not None and now - st.st_mtime > self.ttl and name.endswith('.json'):
+                    self._remove_file(path)
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            self._remove_file(path)
+            total -= size
+
+    def _remove_file(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self.disk_evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "upstream_calls": dict(self.upstream_calls),
+                "saved_calls": dict(self.saved_calls),
+                "saved_tokens": dict(self.saved_tokens),
+                "opt_out": sorted(self.opt_out),
+                "disk_evictions": self.disk_evictions,
+                "memory": self.memory.stats()
+            }
+
+
+class TokenCache:
+    """
+    Verified token claims keyed by a digest of the token, so repeat requests
+    skip signature verification. Entries are dropped once the token's exp
+    claim has passed, at which point verification runs (and fails) again.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._cache = LRUCache(max_bytes)
+        self._lock = threading.Lock()
+        self.verifications = 0
+        self.verify_seconds = 0.0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def verify(self, token: str, decode: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the token's claims, calling decode(token) unless they're cached and unexpired."""
+        key = self._key(token)
+        claims = self._cache.get(key)
+        if claims is not None:
+            exp = claims.get('exp')
+            if exp is None or exp > time.time():
+                return claims
+            self._cache.delete(key)
+
+        started = time.perf_counter()
+        claims = decode(token)
+        with self._lock:
+            self.verifications += 1
+            self.verify_seconds += time.perf_counter() - started
+        self._cache.set(key, claims)
+        return claims
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._cache.stats()
+        with self._lock:
+            average = self.verify_seconds / self.verifications if self.verifications else 0.0
+        stats["avg_verify_ms"] = average * 1000
+        # Every hit skipped one verification
+        stats["seconds_saved"] = stats["hits"] * average
+        return stats
@@ -50,6 +50,20 @@ export interface AnalyzeInterviewResponse {
   feedback: string[];
 }
 
+export interface AnalyzeJobResponse {
+  success: boolean;
+  job_id: string;
+  status: string;
+  status_url: string;
+}
+
+export interface JobStatusResponse<T> {
+  job_id: string;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  result?: T;
+  error?: string;
+}
+
 export interface InterviewHistoryResponse {
   success: boolean;
   interviews: Array<{
@@ -59,6 +73,7 @@ export interface InterviewHistoryResponse {
     overall_score: number;
     scores: any;
   }>;
+  next_cursor: string | null;
 }
 
 export interface InterviewResultsResponse {
@@ -203,13 +218,34 @@ class ApiClient {
   }
 
   async analyzeInterview(sessionId: string): Promise<AnalyzeInterviewResponse> {
-    return this.request<AnalyzeInterviewResponse>(`/api/interview/${sessionId}/analyze`, {
+    const job = await this.request<AnalyzeJobResponse>(`/api/interview/${sessionId}/analyze`, {
       method: 'POST',
     });
+    return this.waitForJob<AnalyzeInterviewResponse>(job.job_id);
+  }
+
+  // Poll a background job until it finishes
+  private async waitForJob<T>(jobId: string, intervalMs = 1000, timeoutMs = 120000): Promise<T> {
+    const deadline = Date.now() + timeoutMs;
+    while (Date.now() < deadline) {
+      const job = await this.request<JobStatusResponse<T>>(`/api/jobs/${jobId}`);
+      if (job.status === 'completed' && job.result) {
+        return job.result;
+      }
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Analysis failed. Please try again later.');
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+    throw new Error('Analysis is taking longer than expected. Please check your history later.');
   }
 
-  async getInterviewHistory(): Promise<InterviewHistoryResponse> {
-    return this.request<InterviewHistoryResponse>('/api/interview/history');
+  async getInterviewHistory(limit?: number, cursor?: string): Promise<InterviewHistoryResponse> {
+    const params = new URLSearchParams();
+    if (limit) params.set('limit', String(limit));
+    if (cursor) params.set('cursor', cursor);
+    const query = params.toString();
+    return this.request<InterviewHistoryResponse>(`/api/interview/history${query ? `?${query}` : ''}`);
   }
 
   async getInterviewResults(interviewId: string): Promise<InterviewResultsResponse> {
@@ -27,7 +27,9 @@ interface Interview {
 const Dashboard = () => {
   const [user, setUser] = useState<User | null>(null);
   const [interviews, setInterviews] = useState<Interview[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
   const { toast } = useToast();
 
@@ -45,6 +47,7 @@ const Dashboard = () => {
         try {
           const historyResponse = await apiClient.getInterviewHistory();
           setInterviews(historyResponse.interviews);
+          setNextCursor(historyResponse.next_cursor);
         } catch (error: any) {
           console.error("Failed to load interview history:", error);
           // Continue with empty interviews array
@@ -59,6 +62,23 @@ const Dashboard = () => {
     checkAuth();
   }, [navigate]);
 
+  const loadMoreInterviews = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const historyResponse = await apiClient.getInterviewHistory(undefined, nextCursor);
+      setInterviews((current) => [...current, ...historyResponse.interviews]);
+      setNextCursor(historyResponse.next_cursor);
+    } catch (error: any) {
+      toast({
+        title: "Couldn't load more interviews",
+        description: error.message || "Please try again.",
+      });
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const quickActions = [
     {
       title: "Upload Résumé",
@@ -182,6 +202,17 @@ const Dashboard = () => {
                     </div>
                   </GlassCard>
                 ))}
+                {nextCursor && (
+                  <div className="flex justify-center pt-2">
+                    <GradientButton
+                      gradient="secondary"
+                      onClick={loadMoreInterviews}
+                      disabled={loadingMore}
+                    >
+                      {loadingMore ? "Loading..." : "Load More"}
+                    </GradientButton>
+                  </div>
+                )}
               </div>
             ) : (
               <GlassCard>
@@ -0,0 +1,274 @@
+"""
+Bulk resume ingestion.
+
+    python ingest.py resumes/ more/candidate.pdf --workers 8
+
+Each file is stored under its base name (without extension), exactly as if
+it had been sent to /api/upload-resume. PDF extraction, chunking and
+embedding run in a process pool; Qdrant upserts go out from this process in
+size-bounded batches. Files that fail are reported and skipped; a failed
+batch fails every file in it, and each file is written completely or not at all.
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from main import (
+    extract_resume_text,
+    prepare_resume_chunks,
+    embed_chunks,
+    resume_payload,
+    diff_resume_points,
+    upsert_resume_points,
+    delete_resume_points,
+    initialize_qdrant,
+)
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.txt', '.doc', '.docx')
+
+
+def find_resume_files(paths):
+    """Expand files and directories into the list of supported resume files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(
+                    os.path.join(root, name) for name in sorted(names)
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS)
+                )
+        else:
+            files.append(path)
+    return files
+
+
+def process_resume_file(path):
+    """Extract, chunk and embed one resume. Runs in a pool worker."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    try:
+        started = time.perf_counter()
+        with open(path, 'rb') as f:
+            resume_text = extract_resume_text(path, f)
+        if resume_text is None:
+            raise ValueError("Unsupported file format")
+        if not resume_text.strip():
+            raise ValueError("Could not extract text from resume")
+        extracted = time.perf_counter()
+
+        ids, chunks, hashes = prepare_resume_chunks(name, resume_text)
+        vectors = embed_chunks(chunks) if chunks else None
+        embedded = time.perf_counter()
+
+        return {
+            "path": path,
+            "name": name,
+            "ids": ids,
+            "chunks": chunks,
+            "hashes": hashes,
+            "vectors": vectors,
+            "extract_seconds": extracted - started,
+            "embed_seconds": embedded - extracted,
+        }
+    except Exception as e:
+        return {"path": path, "name": name, "error": str(e)}
+
+
+class BatchError(Exception):
+    """Raised when a batch fails to reach Qdrant; paths are the files it held."""
+
+    def __init__(self, paths, error):
+        super().__init__(str(error))
+        self.paths = paths
+
+
+class UpsertBatcher:
+    """
+    Buffer points and send them to Qdrant once the buffer reaches its size
+    limit. A file's points are always queued together and written in the
+    same flush, so each file is ingested completely or not at all.
+    """
+
+    def __init__(self, max_points, max_bytes):
+        self.max_points = max_points
+        self.max_bytes = max_bytes
+        self.points_sent = 0
+        self.batches_sent = 0
+        self.seconds = 0.0
+        self._clear()
+
+    def _clear(self):
+        self.ids = []
+        self.vectors = []
+        self.payloads = []
+        self.sizes = []
+        self.obsolete = []
+        self.results = []
+        self.size = 0
+
+    def add_resume(self, result):
+        """
+        Queue every changed chunk of one processed resume. Returns the results
+        written if this filled the buffer and it was flushed, otherwise [].
+        """
+        name, ids, chunks, hashes = result["name"], result["ids"], result["chunks"], result["hashes"]
+        changed, obsolete = diff_resume_points(name, ids)
+
+        payloads = [resume_payload(name, idx, chunks[idx], hashes[idx]) for idx in changed]
+        sizes = [result["vectors"][idx].nbytes + len(chunks[idx].encode()) for idx in changed]
+        self.ids.extend(ids[idx] for idx in changed)
+        self.vectors.extend(result["vectors"][idx] for idx in changed)
+        self.payloads.extend(payloads)
+        self.sizes.extend(sizes)
+        self.size += sum(sizes)
+        # Old points are only deleted once their replacements are written
+        self.obsolete.extend(obsolete)
+        self.results.append(result)
+
+        if len(self.ids) >= self.max_points or self.size >= self.max_bytes:
+            return self.flush()
+        return []
+
+    def _batches(self):
+        """Split the buffer into index ranges within max_points and max_bytes."""
+        start = size = 0
+        for end, point_size in enumerate(self.sizes):
+            if end > start and (end - start >= self.max_points or size + point_size > self.max_bytes):
+                yield start, end
+                start, size = end, 0
+            size += point_size
+        if start < len(self.ids):
+            yield start, len(self.ids)
+
+    def flush(self):
+        """
+        Write everything buffered and return the results it covered. On error
+        the buffer is dropped and BatchError names every file that was in it.
+        """
+        results = self.results
+        started = time.perf_counter()
+        written = 0
+        try:
+            for start, end in self._batches():
+                upsert_resume_points(self.ids[start:end], np.stack(self.vectors[start:end]),
+                                     self.payloads[start:end])
+                written = end
+                self.points_sent += end - start
+                self.batches_sent += 1
+            if self.obsolete:
+                delete_resume_points(self.obsolete)
+        except Exception as e:
+            # Buffered points are all new IDs, so removing the ones already
+            # written leaves every file in the buffer as it was before. If only
+            # the obsolete delete failed, the new points are complete and stay.
+            if 0 < written < len(self.ids):
+                try:
+                    delete_resume_points(self.ids[:written])
+                except Exception as rollback_error:
+                    e = f"{e} (rollback failed: {rollback_error})"
+            raise BatchError([result["path"] for result in results], e)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self._clear()
+        return results
+
+
+def _rate(count, seconds):
+    return count / seconds if seconds > 0 else 0.0
+
+
+def ingest(files, workers, max_points, max_bytes):
+    batcher = UpsertBatcher(max_points, max_bytes)
+    failures = []
+    processed = 0
+    chunks_total = 0
+    extract_seconds = 0.0
+    embed_seconds = 0.0
+    started = time.perf_counter()
+
+    def fail(path, error):
+        failures.append((path, error))
+        print(f"FAILED {path}: {error}", file=sys.stderr)
+
+    def written(results):
+        nonlocal processed, chunks_total, extract_seconds, embed_seconds
+        for result in results:
+            processed += 1
+            chunks_total += len(result["chunks"])
+            extract_seconds += result["extract_seconds"]
+            embed_seconds += result["embed_seconds"]
+
+    def store(action):
+        """Run a batcher call, counting the files it wrote or failing all of them."""
+        try:
+            written(action())
+        except BatchError as e:
+            for path in e.paths:
+                fail(path, f"Error storing in Qdrant: {e}")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        remaining = iter(files)
+        # Keep a bounded number of files in flight so results don't pile up
+        for path in remaining:
+            pending.add(pool.submit(process_resume_file, path))
+            if len(pending) >= workers * 2:
+                break
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"path": "<unknown>", "error": f"Worker failed: {e}"}
+
+                if "error" in result:
+                    fail(result["path"], result["error"])
+                else:
+                    try:
+                        store(lambda: batcher.add_resume(result))
+                    except Exception as e:
+                        # Nothing of this file was queued
+                        fail(result["path"], f"Error storing in Qdrant: {e}")
+
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.add(pool.submit(process_resume_file, next_path))
+
+    store(batcher.flush)
+    elapsed = time.perf_counter() - started
+
+    print(f"Ingested {processed}/{len(files)} files ({len(failures)} failed) in {elapsed:.1f}s")
+    print(f"  extract: {_rate(processed, extract_seconds):.1f} files/s per worker")
+    print(f"  embed:   {_rate(chunks_total, embed_seconds):.1f} chunks/s per worker")
+    print(f"  upsert:  {_rate(batcher.points_sent, batcher.seconds):.1f} points/s "
+          f"({batcher.points_sent} points in {batcher.batches_sent} batches)")
+    print(f"  overall: {_rate(processed, elapsed):.1f} files/s")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-ingest resumes into Qdrant")
+    parser.add_argument("paths", nargs="+", help="Resume files or directories")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-points", type=int, default=512,
+                        help="Maximum points per Qdrant upsert")
+    parser.add_argument("--batch-bytes", type=int, default=8 * 1024 * 1024,
+                        help="Maximum vector + text bytes per Qdrant upsert")
+    args = parser.parse_args()
+
+    files = find_resume_files(args.paths)
+    if not files:
+        print("No resume files found", file=sys.stderr)
+        return 1
+
+    initialize_qdrant()
+    failures = ingest(files, args.workers, args.batch_points, args.batch_bytes)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
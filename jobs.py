@@ -0,0 +1,264 @@
+import time
+import uuid
+import queue
+import datetime
+import threading
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, Optional
+
+
+class QueueFullError(Exception):
+    """Raised when a job queue is at capacity."""
+
+
+class UserLimitError(Exception):
+    """Raised when a user already has the maximum number of jobs in flight."""
+
+
+class JobQueue:
+    """
+    In-process background job queue served by a fixed pool of worker threads.
+    The queue is bounded (submit fails fast when it is full) and each user may
+    only have a limited number of queued or running jobs. If a storage backend
+    is given, job state is also written to it as job_<id> so any gunicorn
+    worker can answer status requests; finished jobs are deleted from it
+    once they are older than job_ttl seconds.
+    """
+
+    def __init__(self, name: str, workers: int = 2, max_queued: int = 100,
+                 per_user_limit: int = 2, storage=None, job_ttl: float = 24 * 3600,
+                 latency_window: int = 1000):
+        self.name = name
+        self.workers = workers
+        self.per_user_limit = per_user_limit
+        self.storage = storage
+        self.job_ttl = job_ttl
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=max_queued)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, tuple] = {}
+        self._active_per_user: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._finished = deque(maxlen=1000)
+        # (expires_at, user_id, job_id) of finished jobs persisted by this process
+        self._expiring = deque()
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.running = 0
+        self.expired = 0
+        self._wait_times = deque(maxlen=latency_window)
+        self._run_times = deque(maxlen=latency_window)
+
+    def _ensure_workers(self):
+        """Start worker threads on first use, so forked gunicorn workers get their own."""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.storage is not None:
+            # Jobs left behind by earlier processes are only found by a scan
+            threading.Thread(target=self.purge_expired, name=f"{self.name}-purge", daemon=True).start()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+    def _snapshot(self, job: Dict[str, Any]) -> tuple:
+        """Copy a job's public state with a new revision. Call with self._lock held."""
+        job['_revision'] += 1
+        return job['_revision'], self.public_view(job)
+
+    def _persist(self, job: Dict[str, Any], snapshot: tuple):
+        """
+        Write a snapshot taken by _snapshot. Runs outside self._lock so storage
+        I/O doesn't stall other jobs; the per-job lock and revision keep an
+        older snapshot from overwriting a newer one.
+        """
+        if self.storage is None:
+            return
+        revision, view = snapshot
+        with job['_persist_lock']:
+            if revision <= job['_persisted']:
+                return
+            self.storage.save_user_data(view['user_id'], f"job_{view['job_id']}", view)
+            job['_persisted'] = revision
+
+    @staticmethod
+    def _finished_age(job: Dict[str, Any]) -> Optional[float]:
+        """Seconds since a stored job finished, or None if it hasn't."""
+        try:
+            finished = datetime.datetime.fromisoformat(job['finished_at'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return (datetime.datetime.now(datetime.timezone.utc) - finished).total_seconds()
+
+    def _expire(self, user_id: str, job_id: str):
+        if self.storage.delete_user_data(user_id, f"job_{job_id}"):
+            with self._lock:
+                self.expired += 1
+
+    def _expire_due(self):
+        """Delete finished jobs this process persisted once their TTL has passed."""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._expiring and self._expiring[0][0] <= now:
+                due.append(self._expiring.popleft())
+        for _, user_id, job_id in due:
+            self._expire(user_id, job_id)
+
+    def purge_expired(self):
+        """Scan storage for finished jobs older than job_ttl and delete them."""
+        for user_id in self.storage.list_users():
+            for name in self.storage.list_user_files(user_id):
+                if not name.startswith('job_'):
+                    continue
+                job = self.storage.load_user_data(user_id, name)
+                age = self._finished_age(job) if job else None
+                if age is not None and age > self.job_ttl:
+                    self._expire(user_id, name[len('job_'):])
+
+    def submit(self, user_id: str, fn: Callable[..., Any], *args, **kwargs) -> str:
+        """Queue fn(*args, **kwargs) and return its job id."""
+        with self._lock:
+            self._ensure_workers()
+            if self._active_per_user[user_id] >= self.per_user_limit:
+                self.rejected += 1
+                raise UserLimitError(f"At most {self.per_user_limit} jobs may be in progress per user")
+
+            job_id = str(uuid.uuid4())
+            job = {
+                'job_id': job_id,
+                'user_id': user_id,
+                'status': 'queued',
+                'created_at': self._now(),
+                '_enqueued': time.monotonic(),
+                '_revision': 0,
+                '_persisted': 0,
+                '_persist_lock': threading.Lock()
+            }
+            try:
+                self._queue.put_nowait(job_id)
+            except queue.Full:
+                self.rejected += 1
+                raise QueueFullError(f"The {self.name} queue is full, please retry shortly")
+
+            self._jobs[job_id] = job
+            self._tasks[job_id] = (fn, args, kwargs)
+            self._active_per_user[user_id] += 1
+            self.submitted += 1
+            snapshot = self._snapshot(job)
+
+        self._persist(job, snapshot)
+        return job_id
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            with self._lock:
+                job = self._jobs[job_id]
+                fn, args, kwargs = self._tasks.pop(job_id)
+                job['status'] = 'running'
+                job['started_at'] = self._now()
+                started = time.monotonic()
+                self._wait_times.append(started - job['_enqueued'])
+                self.running += 1
+                snapshot = self._snapshot(job)
+            self._persist(job, snapshot)
+
+            try:
+                result = fn(*args, **kwargs)
+                status, error = 'completed', None
+            except Exception as e:
+                print(f"{self.name} job {job_id} failed: {e}")
+                result, status, error = None, 'failed', str(e)
+
+            with self._lock:
+                job['status'] = status
+                job['result'] = result
+                job['error'] = error
+                job['finished_at'] = self._now()
+                self._run_times.append(time.monotonic() - started)
+                self.running -= 1
+                self._active_per_user[job['user_id']] -= 1
+                if not self._active_per_user[job['user_id']]:
+                    del self._active_per_user[job['user_id']]
+                if status == 'completed':
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                snapshot = self._snapshot(job)
+                # Keep memory bounded: finished state lives in storage, or
+                # only the most recent results are kept
+                if self.storage is None:
+                    if len(self._finished) == self._finished.maxlen:
+                        self._jobs.pop(self._finished[0], None)
+                    self._finished.append(job_id)
+
+            if self.storage is not None:
+                # Drop the in-memory copy only once storage has the final state
+                self._persist(job, snapshot)
+                with self._lock:
+                    del self._jobs[job_id]
+                    self._expiring.append((time.monotonic() + self.job_ttl, job['user_id'], job_id))
+                self._expire_due()
+            self._queue.task_done()
+
+    def pending(self, user_id: str) -> int:
+        """Number of the user's jobs queued or running in this process."""
+        with self._lock:
+            return self._active_per_user.get(user_id, 0)
+
+    @staticmethod
+    def public_view(job: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in job.items() if not key.startswith('_')}
+
+    def get(self, user_id: str, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a user's job state, or None if it doesn't exist."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return self.public_view(job) if job['user_id'] == user_id else None
+        if self.storage is not None:
+            job = self.storage.load_user_data(user_id, f"job_{job_id}")
+            if job is not None:
+                age = self._finished_age(job)
+                if age is not None and age > self.job_ttl:
+                    self._expire(user_id, job_id)
+                    return None
+                job.pop('_metadata', None)
+            return job
+        return None
+
+    @staticmethod
+    def _percentiles(samples) -> Dict[str, float]:
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+        ordered = sorted(samples)
+        return {
+            "p50": ordered[len(ordered) // 2],
+            "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            "max": ordered[-1]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queued": self._queue.maxsize,
+                "running": self.running,
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "expired": self.expired,
+                "wait_seconds": self._percentiles(self._wait_times),
+                "run_seconds": self._percentiles(self._run_times)
+            }
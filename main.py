@@ -1,19 +1,23 @@
 import os
 import re
+import sys
+import time
 import uuid
-from flask import Flask, request, jsonify, send_file
+import hmac
+import hashlib
+import numpy as np
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 from PyPDF2 import PdfReader
 from openai import OpenAI
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import Distance, VectorParams, Filter, FieldCondition, MatchValue, PointIdsList
 from groq import Groq
+from cache import LRUCache, ResponseCache, TokenCache
 import io
 import jwt
 import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from functools import wraps
-import base64
 import json
 
 app = Flask(__name__)
@@ -29,13 +33,85 @@ qdrant_client = QdrantClient(
 COLLECTION_NAME = "resumes"
 VECTOR_SIZE = 384
 
+# Byte of the SHA-256 digest feeding each embedding dimension
+DIGEST_SIZE = hashlib.sha256().digest_size
+EMBEDDING_BYTE_INDEX = np.arange(VECTOR_SIZE) % DIGEST_SIZE
+
+# Limits that keep one oversized upload from stalling a worker
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 50))
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", 10 * 1024 * 1024))
+
+# Chunk cut mode: "char" (fixed windows), "word" or "sentence"
+CHUNK_BOUNDARY = os.getenv("CHUNK_BOUNDARY", "char")
+# Chunks embedded and upserted per Qdrant request
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", 64))
+
+RESUME_SCROLL_PAGE_SIZE = 256
+# Namespace for deterministic resume point IDs; never change it
+RESUME_POINT_NAMESPACE = uuid.UUID("5d0c2f7e-8a4b-4d6e-9f31-2c7b1e0a9d43")
+# Resume characters included in the question-generation prompt
+RESUME_PROMPT_CHARS = 3000
+QUESTIONS_MODEL = "openai/gpt-oss-20b"
+
+# Assembled resume text keyed by lowercase name. Entries are
+# (text, complete, point_ids, checked_at) where complete is False for a
+# max_chars prefix. Uploads from other workers or ingest.py don't reach this
+# process's cache, so a hit older than RESUME_CACHE_CHECK_SECONDS is checked
+# against the resume's point IDs in Qdrant (content-addressed, so they change
+# whenever the text does) before it is trusted. That bounds staleness to
+# RESUME_CACHE_CHECK_SECONDS rather than RESUME_CACHE_TTL.
+RESUME_CACHE_CHECK_SECONDS = float(os.getenv("RESUME_CACHE_CHECK_SECONDS", 5))
+resume_cache = LRUCache(
+    max_bytes=int(os.getenv("RESUME_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+    ttl=float(os.getenv("RESUME_CACHE_TTL", 600)),
+    sizeof=lambda entry: sys.getsizeof(entry[0])
+)
+
 # Authentication configuration
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
-users_db = {}  # In production, use a proper database
 
 # Import AI service and storage
-from ai_service import ai_service
-from storage import interview_storage
+from ai_service import ai_service, response_cache
+from storage import storage, interview_storage, user_store, SCORE_DIMENSIONS
+from jobs import JobQueue, QueueFullError, UserLimitError
+from passwords import password_hasher, PasswordPoolBusyError
+from stt import (
+    AudioTooLargeError, SegmentExistsError, transcript_streams, split_data_url,
+    normalize_base64, is_base64,
+    spool_stream, b64encode_file, RequestTimer
+)
+
+# Background interview analysis; Gemini calls can take 30s+ with retries
+analysis_queue = JobQueue(
+    "analysis",
+    workers=int(os.getenv("ANALYSIS_WORKERS", 4)),
+    max_queued=int(os.getenv("ANALYSIS_MAX_QUEUED", 100)),
+    per_user_limit=int(os.getenv("ANALYSIS_PER_USER_LIMIT", 2)),
+    storage=storage,
+    job_ttl=float(os.getenv("ANALYSIS_JOB_TTL", 24 * 3600))
+)
+
+# Per-answer scoring while the interview is still in progress
+scoring_queue = JobQueue(
+    "scoring",
+    workers=int(os.getenv("SCORING_WORKERS", 4)),
+    max_queued=int(os.getenv("SCORING_MAX_QUEUED", 500)),
+    per_user_limit=int(os.getenv("SCORING_PER_USER_LIMIT", 20))
+)
+# How long analysis waits for answers still being scored before evaluating them itself
+SCORING_WAIT_SECONDS = float(os.getenv("SCORING_WAIT_SECONDS", 10))
+
+# /api/interview/history page sizes
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+
+# Verified tokens are cached so polling and answer bursts skip the HMAC check
+token_cache = TokenCache(max_bytes=int(os.getenv("TOKEN_CACHE_MAX_BYTES", 4 * 1024 * 1024)))
+# How long authenticated requests trust the in-memory user index before re-checking the log
+USER_REFRESH_SECONDS = float(os.getenv("USER_REFRESH_SECONDS", 1.0))
+
+def decode_token(token):
+    return jwt.decode(token, JWT_SECRET_KEY, algorithms=["HS256"])
 
 # JWT token required decorator
 def token_required(f):
@@ -47,8 +123,8 @@ def token_required(f):
         try:
             if token.startswith('Bearer '):
                 token = token.split(' ')[1]
-            data = jwt.decode(token, JWT_SECRET_KEY, algorithms=["HS256"])
-            current_user = users_db.get(data['user_id'])
+            data = token_cache.verify(token, decode_token)
+            current_user = user_store.get_by_id(data['user_id'], max_age=USER_REFRESH_SECONDS)
             if not current_user:
                 return jsonify({'message': 'User not found!'}), 401
         except jwt.ExpiredSignatureError:
@@ -58,6 +134,22 @@ def token_required(f):
         return f(current_user, *args, **kwargs)
     return decorated
 
+# Operator token for /api/metrics; the endpoint is disabled while it's unset
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+def metrics_token_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if not METRICS_TOKEN:
+            return jsonify({'message': 'Not found'}), 404
+        token = request.headers.get('Authorization', '')
+        if token.startswith('Bearer '):
+            token = token.split(' ')[1]
+        if not hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+            return jsonify({'message': 'Token is invalid!'}), 401
+        return f(*args, **kwargs)
+    return decorated
+
 # Authentication endpoints
 @app.route('/api/auth/register', methods=['POST'])
 def register():
@@ -85,20 +177,25 @@ def register():
             return jsonify({'message': 'Passwords do not match'}), 400
         
         # Check if user already exists
-        if any(user['email'] == email for user in users_db.values()):
+        if user_store.get_by_email(email):
             return jsonify({'message': 'User already exists'}), 409
         
         # Create new user
         user_id = str(uuid.uuid4())
-        hashed_password = generate_password_hash(password)
+        try:
+            hashed_password = password_hasher.hash(password)
+        except PasswordPoolBusyError as e:
+            return jsonify({'message': str(e)}), 503, {'Retry-After': '2'}
         
-        users_db[user_id] = {
+        user = {
             'id': user_id,
             'name': name,
             'email': email,
             'password': hashed_password,
             'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat()
         }
+        if not user_store.add_user(user):
+            return jsonify({'message': 'User already exists'}), 409
         
         # Generate JWT token
         token = jwt.encode({
@@ -113,7 +210,7 @@ def register():
                 'id': user_id,
                 'name': name,
                 'email': email,
-                'createdAt': users_db[user_id]['created_at']
+                'createdAt': user['created_at']
             }
         }), 201
         
@@ -132,18 +229,18 @@ def login():
         password = data['password']
         
         # Find user by email
-        user = None
-        user_id = None
-        for uid, user_data in users_db.items():
-            if user_data['email'] == email:
-                user = user_data
-                user_id = uid
-                break
+        user = user_store.get_by_email(email)
         
-        if not user or not check_password_hash(user['password'], password):
+        try:
+            valid = user is not None and password_hasher.verify(user['password'], password)
+        except PasswordPoolBusyError as e:
+            return jsonify({'message': str(e)}), 503, {'Retry-After': '2'}
+
+        if not valid:
             return jsonify({'message': 'Invalid email or password'}), 401
         
         # Generate JWT token
+        user_id = user['id']
         token = jwt.encode({
             'user_id': user_id,
             'exp': datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=7)
@@ -196,110 +293,484 @@ def initialize_qdrant():
         print(f"Error initializing Qdrant: {e}")
 
 
-def extract_text_from_pdf(pdf_bytes):
+class ResumeLimitError(Exception):
+    """Raised when an upload exceeds the configured page or byte limits."""
+
+def _remaining_size(stream):
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size - position
+
+def iter_pdf_pages(stream, max_pages=None, max_bytes=None):
+    """Yield the text of each page of a PDF read from a seekable binary stream."""
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_bytes = PDF_MAX_BYTES if max_bytes is None else max_bytes
+
+    if _remaining_size(stream) > max_bytes:
+        raise ResumeLimitError(f"PDF is larger than the {max_bytes} byte limit")
+
+    reader = PdfReader(stream)
+    if len(reader.pages) > max_pages:
+        raise ResumeLimitError(f"PDF has more than the {max_pages} page limit")
+
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+def extract_text_from_pdf(pdf):
+    """Extract text from PDF bytes or a seekable binary stream."""
     try:
-        pdf_file = io.BytesIO(pdf_bytes)
-        reader = PdfReader(pdf_file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ""
-        return text
+        if isinstance(pdf, (bytes, bytearray)):
+            pdf = io.BytesIO(pdf)
+        return "".join(iter_pdf_pages(pdf))
+    except ResumeLimitError:
+        raise
     except Exception as e:
         raise Exception(f"Error extracting PDF text: {str(e)}")
 
-def chunk_text(text, chunk_size=1000, overlap=200):
-    chunks = []
+def extract_resume_text(filename, stream):
+    """Extract text from an uploaded resume. Returns None for unsupported formats."""
+    filename = filename.lower()
+    if filename.endswith('.pdf'):
+        return extract_text_from_pdf(stream)
+    elif filename.endswith(('.txt', '.doc', '.docx')):
+        return stream.read().decode('utf-8', errors='ignore')
+    return None
+
+SENTENCE_ENDINGS = ('. ', '! ', '? ', '\n')
+
+def _word_boundary(text, start, end):
+    """Pull end back to just after the last whitespace in text[start:end]."""
+    cut = end
+    while cut > start and not text[cut - 1].isspace():
+        cut -= 1
+    # A single word longer than the window has to be split
+    return cut if cut > start else end
+
+def _sentence_boundary(text, start, end):
+    """Pull end back to the last sentence ending in the second half of the window."""
+    half = start + (end - start) // 2
+    cut = max(text.rfind(ending, half, end) for ending in SENTENCE_ENDINGS)
+    if cut == -1:
+        return _word_boundary(text, start, end)
+    return cut + 1
+
+def iter_chunk_spans(text, chunk_size=1000, overlap=200, boundary="char"):
+    """
+    Yield (start, end) offsets of overlapping chunks of text, without copying it.
+    Spans exclude surrounding whitespace and whitespace-only chunks are skipped.
+    boundary="char" cuts every chunk_size characters; "word" and "sentence"
+    pull each cut back so words (or sentences, where possible) stay whole.
+    """
+    length = len(text)
     start = 0
-    while start < len(text):
-        end = start + chunk_size
-        chunk = text[start:end]
-        if chunk.strip():
-            chunks.append(chunk.strip())
-        start += (chunk_size - overlap)
-    return chunks
+    while start < length:
+        end = min(start + chunk_size, length)
+        if end < length and boundary != "char" and not text[end].isspace():
+            if boundary == "sentence":
+                end = _sentence_boundary(text, start, end)
+            else:
+                end = _word_boundary(text, start, end)
+
+        span_start, span_end = start, end
+        while span_start < span_end and text[span_start].isspace():
+            span_start += 1
+        while span_end > span_start and text[span_end - 1].isspace():
+            span_end -= 1
+        if span_start < span_end:
+            yield span_start, span_end
+
+        if boundary == "char":
+            start += chunk_size - overlap
+            continue
+
+        if end >= length:
+            break
+        # Step back by the overlap, then forward to the start of a word
+        next_start = max(end - overlap, start + 1)
+        while next_start < end and not text[next_start - 1].isspace():
+            next_start += 1
+        start = next_start
+
+def chunk_text(text, chunk_size=1000, overlap=200, boundary=None):
+    """Lazily yield the stripped text of each chunk."""
+    boundary = boundary or CHUNK_BOUNDARY
+    for start, end in iter_chunk_spans(text, chunk_size, overlap, boundary):
+        yield text[start:end]
+
+def create_embeddings(texts, dtype=np.float32):
+    """
+    Embed a batch of texts in one vectorized pass.
+    Returns a C-contiguous (len(texts), VECTOR_SIZE) matrix. Values match
+    create_simple_embedding element for element.
+    """
+    digests = b"".join(hashlib.sha256(text.encode()).digest() for text in texts)
+    hash_bytes = np.frombuffer(digests, dtype=np.uint8).reshape(len(texts), DIGEST_SIZE)
+
+    # Repeat each digest across the vector, then scale bytes into [-1, 1]
+    vectors = hash_bytes[:, EMBEDDING_BYTE_INDEX] / 255.0 * 2 - 1
+    return np.ascontiguousarray(vectors, dtype=dtype)
 
 def create_simple_embedding(text):
-    import hashlib
-    
-    hash_obj = hashlib.sha256(text.encode())
-    hash_bytes = hash_obj.digest()
-    
-    vector = []
-    for i in range(VECTOR_SIZE):
-        byte_val = hash_bytes[i % len(hash_bytes)]
-        vector.append((byte_val / 255.0) * 2 - 1)
-    
-    return vector
+    return create_embeddings([text], dtype=np.float64)[0].tolist()
+
+class HashEmbedder:
+    """SHA-256 stand-in embedder. Fast, but the vectors carry no meaning."""
+
+    name = "hash"
+    # Hashing a chunk is cheaper than reading its vector back from disk
+    cacheable = False
+
+    def embed(self, texts):
+        return create_embeddings(texts)
+
+class MiniLMEmbedder:
+    """
+    Local CPU sentence embedder backed by an ONNX export of a MiniLM-class
+    model (e.g. all-MiniLM-L6-v2, which is 384-dim like VECTOR_SIZE).
+    model_dir must contain model.onnx and tokenizer.json; nothing is
+    downloaded at inference time. Needs onnxruntime and tokenizers.
+    """
+
+    name = "minilm"
+    cacheable = True
+
+    def __init__(self, model_dir, batch_size=32, max_length=256):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.batch_size = batch_size
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, "model.onnx"),
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def embed(self, texts):
+        vectors = np.empty((len(texts), VECTOR_SIZE), dtype=np.float32)
+        for start in range(0, len(texts), self.batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + self.batch_size])
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.zeros_like(input_ids)
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean-pool over real tokens, then L2-normalise for cosine distance
+            mask = attention_mask[:, :, None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            vectors[start:start + len(encodings)] = pooled
+        return vectors
+
+class EmbeddingCache:
+    """
+    Content-addressed on-disk vector cache.
+    Vectors are stored as <cache_dir>/<embedder>/<hh>/<sha256>.npy.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _path(self, embedder_name, key):
+        return os.path.join(self.cache_dir, embedder_name, key[:2], f"{key}.npy")
+
+    def get(self, embedder_name, key):
+        try:
+            return np.load(self._path(embedder_name, key))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, embedder_name, key, vector):
+        path = self._path(embedder_name, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent workers never read a partial file
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, vector)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error caching embedding: {e}")
+
+def get_embedder():
+    """Build the embedder selected by the EMBEDDER environment variable."""
+    backend = os.getenv("EMBEDDER", "hash").lower()
+    if backend == "minilm":
+        try:
+            return MiniLMEmbedder(os.getenv("EMBEDDING_MODEL_DIR", "models/all-MiniLM-L6-v2"))
+        except Exception as e:
+            print(f"Error loading MiniLM embedder, falling back to hash: {e}")
+    return HashEmbedder()
+
+embedder = get_embedder()
+embedding_cache = EmbeddingCache(os.getenv("EMBEDDING_CACHE_DIR", "/tmp/embedding_cache"))
+
+def embed_chunks(chunks):
+    """Embed chunks with the configured embedder, reusing cached vectors."""
+    if not embedder.cacheable:
+        return embedder.embed(chunks)
+
+    keys = [hashlib.sha256(chunk.encode()).hexdigest() for chunk in chunks]
+    vectors = np.empty((len(chunks), VECTOR_SIZE), dtype=np.float32)
+    missing = []
+    for idx, key in enumerate(keys):
+        cached = embedding_cache.get(embedder.name, key)
+        if cached is None:
+            missing.append(idx)
+        else:
+            vectors[idx] = cached
+
+    if missing:
+        computed = embedder.embed([chunks[idx] for idx in missing])
+        for idx, vector in zip(missing, computed):
+            vectors[idx] = vector
+            embedding_cache.put(embedder.name, keys[idx], vector)
+
+    return vectors
+
+def resume_point_id(name, chunk_index, content_hash):
+    """
+    Deterministic point ID, so re-uploading a chunk overwrites itself.
+    The embedder is part of the ID, so switching EMBEDDER re-embeds
+    every chunk instead of keeping vectors from the old model.
+    """
+    return str(uuid.uuid5(
+        RESUME_POINT_NAMESPACE,
+        f"{embedder.name}:{VECTOR_SIZE}:{name.lower()}:{chunk_index}:{content_hash}"
+    ))
+
+def iter_resume_chunk_batches(name, resume_text, batch_size=EMBED_BATCH_SIZE):
+    """
+    Lazily chunk a resume, yielding lists of at most batch_size
+    (chunk_index, point_id, chunk, content_hash) tuples.
+    """
+    batch = []
+    for idx, chunk in enumerate(chunk_text(resume_text)):
+        content_hash = hashlib.sha256(chunk.encode()).hexdigest()
+        batch.append((idx, resume_point_id(name, idx, content_hash), chunk, content_hash))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def prepare_resume_chunks(name, resume_text):
+    """Chunk a resume and derive each chunk's content hash and point ID."""
+    ids, chunks, hashes = [], [], []
+    for batch in iter_resume_chunk_batches(name, resume_text):
+        for _, point_id, chunk, content_hash in batch:
+            ids.append(point_id)
+            chunks.append(chunk)
+            hashes.append(content_hash)
+    return ids, chunks, hashes
+
+def resume_payload(name, chunk_index, chunk, content_hash):
+    return {
+        "name": name.lower(),
+        "chunk_text": chunk,
+        "chunk_index": chunk_index,
+        "content_hash": content_hash,
+        "embedder": embedder.name
+    }
+
+def existing_resume_point_ids(name):
+    return {
+        str(point.id)
+        for page in _scroll_resume_points(name, with_payload=False)
+        for point in page
+    }
+
+def diff_resume_points(name, ids):
+    """
+    Compare a resume's new point IDs with what Qdrant holds.
+    Returns (indices of ids that need upserting, existing IDs to delete).
+    """
+    existing_ids = existing_resume_point_ids(name)
+    changed = [idx for idx, point_id in enumerate(ids) if point_id not in existing_ids]
+    obsolete = existing_ids.difference(ids)
+    return changed, obsolete
+
+def upsert_resume_points(ids, vectors, payloads):
+    qdrant_client.upload_collection(
+        collection_name=COLLECTION_NAME,
+        vectors=vectors,
+        payload=payloads,
+        ids=ids,
+        batch_size=len(ids),
+        wait=True
+    )
+
+def delete_resume_points(point_ids):
+    qdrant_client.delete(
+        collection_name=COLLECTION_NAME,
+        points_selector=PointIdsList(points=list(point_ids)),
+        wait=True
+    )
 
 def store_resume_in_qdrant(name, resume_text):
+    """
+    Sync a resume's chunks into Qdrant.
+    Chunks are produced, embedded and upserted one batch at a time, so
+    memory stays flat however long the resume is. Only chunks whose
+    (index, content) changed are embedded; points left over from the
+    previous upload are deleted in one batch at the end.
+    """
     try:
-        chunks = chunk_text(resume_text)
-        
-        points = []
-        for idx, chunk in enumerate(chunks):
-            point_id = str(uuid.uuid4())
-            vector = create_simple_embedding(chunk)
-            
-            point = PointStruct(
-                id=point_id,
-                vector=vector,
-                payload={
-                    "name": name.lower(),
-                    "chunk_text": chunk,
-                    "chunk_index": idx
-                }
+        existing_ids = existing_resume_point_ids(name)
+        seen_ids = set()
+
+        for batch in iter_resume_chunk_batches(name, resume_text):
+            changed = [record for record in batch if record[1] not in existing_ids]
+            seen_ids.update(record[1] for record in batch)
+            if not changed:
+                continue
+
+            upsert_resume_points(
+                [point_id for _, point_id, _, _ in changed],
+                embed_chunks([chunk for _, _, chunk, _ in changed]),
+                [resume_payload(name, idx, chunk, h) for idx, _, chunk, h in changed]
             )
-            points.append(point)
-        
-        qdrant_client.upsert(
-            collection_name=COLLECTION_NAME,
-            points=points
-        )
+
+        obsolete = existing_ids - seen_ids
+        if obsolete:
+            delete_resume_points(obsolete)
+
+        resume_cache.delete(name.lower())
         
-        return len(points)
+        return len(seen_ids)
     except Exception as e:
         raise Exception(f"Error storing in Qdrant: {str(e)}")
 
-def get_resume_by_name(name):
-    try:
-        dummy_vector = [0.0] * VECTOR_SIZE
-        
-        results = qdrant_client.scroll(
+def _resume_filter(name):
+    return Filter(must=[FieldCondition(key="name", match=MatchValue(value=name.lower()))])
+
+def _scroll_resume_points(name, with_payload, page_size=RESUME_SCROLL_PAGE_SIZE):
+    """Yield pages of a resume's points, following scroll offsets to the end."""
+    offset = None
+    while True:
+        points, offset = qdrant_client.scroll(
             collection_name=COLLECTION_NAME,
-            scroll_filter={
-                "must": [
-                    {
-                        "key": "name",
-                        "match": {
-                            "value": name.lower()
-                        }
-                    }
-                ]
-            },
-            limit=100
+            scroll_filter=_resume_filter(name),
+            limit=page_size,
+            offset=offset,
+            with_payload=with_payload,
+            with_vectors=False
         )
-        
-        if not results[0]:
+        if points:
+            yield points
+        if offset is None:
+            break
+
+def iter_resume_chunks(name):
+    """
+    Yield a resume's chunk texts in chunk_index order as pages arrive.
+    Chunks that arrive ahead of a gap are held back until it is filled.
+    """
+    pending = {}
+    next_index = 0
+    for page in _scroll_resume_points(name, with_payload=["chunk_text", "chunk_index"]):
+        for point in page:
+            idx = point.payload.get("chunk_index", 0)
+            if idx >= next_index:
+                pending.setdefault(idx, point.payload["chunk_text"])
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+
+    # Missing indices shouldn't happen, but don't drop what we did get
+    for idx in sorted(pending):
+        yield pending[idx]
+
+def get_resume_by_name(name, max_chars=None):
+    """
+    Assemble a resume from its chunks, serving repeat lookups from resume_cache.
+    With max_chars, stop fetching once at least that much text is available.
+    """
+    key = name.lower()
+    cached = resume_cache.get(key)
+    if cached:
+        text, complete, point_ids, checked_at = cached
+        if complete or (max_chars is not None and len(text) >= max_chars):
+            if time.monotonic() - checked_at < RESUME_CACHE_CHECK_SECONDS:
+                return text
+            try:
+                current_ids = frozenset(existing_resume_point_ids(name))
+            except Exception as e:
+                raise Exception(f"Error retrieving from Qdrant: {str(e)}")
+            if current_ids == point_ids:
+                resume_cache.set(key, (text, complete, point_ids, time.monotonic()))
+                return text
+
+    try:
+        # Read the IDs first so a concurrent upload makes the entry look
+        # stale rather than pairing new text with the old version
+        point_ids = frozenset(existing_resume_point_ids(name))
+        parts = []
+        length = 0
+        complete = True
+        for chunk in iter_resume_chunks(name):
+            length += len(chunk) + (1 if parts else 0)
+            parts.append(chunk)
+            if max_chars is not None and length >= max_chars:
+                complete = False
+                break
+
+        if not parts:
             return None
-        
-        chunks = sorted(results[0], key=lambda x: x.payload.get("chunk_index", 0))
-        full_text = "\n".join([chunk.payload["chunk_text"] for chunk in chunks])
-        
+
+        full_text = "\n".join(parts)
+        resume_cache.set(key, (full_text, complete, point_ids, time.monotonic()))
         return full_text
     except Exception as e:
         raise Exception(f"Error retrieving from Qdrant: {str(e)}")
 
-def generate_interview_questions(resume_text, job_title, num_questions=5):
+def parse_question_line(line):
+    """Return the question on a numbered or bulleted line, or None."""
+    line = line.strip()
+    if line and (line[0].isdigit() or line.startswith('-')):
+        question = re.sub(r'^[\d\.\)\-\s]+', '', line).strip()
+        if question:
+            return question
+    return None
+
+def iter_questions(deltas):
     """
-    Generate interview questions using Groq streaming API.
+    Incrementally parse streamed text deltas into questions.
+    Each question is yielded as soon as the newline ending its line arrives.
     """
-    try:
-        prompt = f"""Based on the following resume and job title, generate {num_questions} relevant interview questions.
+    pending = ""
+    for delta in deltas:
+        pending += delta
+        if "\n" not in pending:
+            continue
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            question = parse_question_line(line)
+            if question:
+                yield question
+
+    question = parse_question_line(pending)
+    if question:
+        yield question
+
+def stream_question_text(resume_text, job_title, num_questions=5):
+    """
+    Yield the text of a Groq question-generation response as it streams in.
+    Cached responses are replayed in one piece; fresh ones are cached once complete.
+    """
+    prompt = f"""Based on the following resume and job title, generate {num_questions} relevant interview questions.
 
 Job Title: {job_title}
 
 Resume:
-{resume_text[:3000]}
+{resume_text[:RESUME_PROMPT_CHARS]}
 
 Generate {num_questions} specific, relevant interview questions that:
 1. Are tailored to the candidate's experience in their resume
@@ -310,34 +781,54 @@ Generate {num_questions} specific, relevant interview questions that:
 Format your response as a numbered list of questions only.
 """
 
-        # Groq streaming API
-        completion = client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert technical interviewer."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_completion_tokens=1000,
-            top_p=1,
-            reasoning_effort="medium",
-            stream=True
-        )
-
-        # Collect streamed content
-        questions_text = ""
-        for chunk in completion:
-            questions_text += chunk.choices[0].delta.content or ""
-
-        # Parse into a clean list
-        questions = []
-        for line in questions_text.split('\n'):
-            line = line.strip()
-            if line and (line[0].isdigit() or line.startswith('-')):
-                question = re.sub(r'^[\d\.\)\-\s]+', '', line).strip()
-                if question:
-                    questions.append(question)
+    messages = [
+        {"role": "system", "content": "You are an expert technical interviewer."},
+        {"role": "user", "content": prompt}
+    ]
+    config = {
+        "temperature": 0.7,
+        "max_completion_tokens": 1000,
+        "top_p": 1,
+        "reasoning_effort": "medium"
+    }
+
+    # Identical resume/job/count requests are answered from the cache
+    use_cache = response_cache.enabled_for("questions")
+    cache_key = ResponseCache.make_key(QUESTIONS_MODEL, config, messages)
+    cached = response_cache.get("questions", cache_key) if use_cache else None
+    if cached is not None:
+        yield cached
+        return
+
+    # Groq streaming API
+    completion = client.chat.completions.create(
+        model=QUESTIONS_MODEL,
+        messages=messages,
+        stream=True,
+        **config
+    )
+
+    parts = []
+    tokens = 0
+    for chunk in completion:
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content or ""
+            if delta:
+                parts.append(delta)
+                yield delta
+        usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+        if usage is not None:
+            tokens = usage.total_tokens
+
+    if use_cache:
+        response_cache.set("questions", cache_key, "".join(parts), tokens)
 
+def generate_interview_questions(resume_text, job_title, num_questions=5):
+    """
+    Generate interview questions using Groq streaming API.
+    """
+    try:
+        questions = list(iter_questions(stream_question_text(resume_text, job_title, num_questions)))
         return questions[:num_questions]
 
     except Exception as e:
@@ -349,6 +840,21 @@ Format your response as a numbered list of questions only.
 def health_check():
     return jsonify({"status": "healthy", "message": "API is running"}), 200
 
+@app.route('/api/metrics', methods=['GET'])
+@metrics_token_required
+def get_metrics():
+    return jsonify({
+        "resume_cache": resume_cache.stats(),
+        "analysis_queue": analysis_queue.stats(),
+        "scoring_queue": scoring_queue.stats(),
+        "llm_cache": response_cache.stats(),
+        "session_cache": interview_storage.sessions.stats(),
+        "token_cache": token_cache.stats(),
+        "user_store": user_store.stats(),
+        "password_pool": password_hasher.stats(),
+        "stt": ai_service.audio_stats()
+    }), 200
+
 # Interview API endpoints
 @app.route('/api/interview/start', methods=['POST'])
 @token_required
@@ -393,31 +899,43 @@ def submit_answer(current_user, session_id):
         if not data or not data.get('answer'):
             return jsonify({"error": "Answer is required"}), 400
 
-        # Get current session
-        session = interview_storage.get_interview_session(current_user['id'], session_id)
-        if not session:
-            return jsonify({"error": "Interview session not found"}), 404
-
-        # Add answer to session
-        answer_data = {
-            'question': session['questions'][session['current_question_index']],
-            'answer': data['answer'],
-            'question_index': session['current_question_index'],
-            'submitted_at': datetime.datetime.now(datetime.timezone.utc).isoformat()
-        }
+        submitted = {}
 
-        session['answers'].append(answer_data)
-        session['current_question_index'] += 1
+        def add_answer(session):
+            # Add answer to session
+            index = session['current_question_index']
+            answer_data = {
+                'question': session['questions'][index],
+                'answer': data['answer'],
+                'question_index': index,
+                'submitted_at': datetime.datetime.now(datetime.timezone.utc).isoformat()
+            }
+            changes = {'current_question_index': index + 1}
 
-        # Check if interview is complete
-        if session['current_question_index'] >= len(session['questions']):
-            session['status'] = 'completed'
-            session['completed_at'] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            # Check if interview is complete
+            if index + 1 >= len(session['questions']):
+                changes['status'] = 'completed'
+                changes['completed_at'] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            submitted.update(answer_data)
+            return {'set': changes, 'append': {'answers': answer_data}}
 
-        success = interview_storage.save_interview_session(current_user['id'], session)
-        if not success:
+        # Only this answer is logged; the session file is rewritten in the background
+        session = interview_storage.update_interview_session(current_user['id'], session_id, add_answer)
+        if not session:
+            if not submitted:
+                return jsonify({"error": "Interview session not found"}), 404
             return jsonify({"error": "Failed to save answer"}), 500
 
+        if session['status'] == 'completed':
+            interview_storage.flush_interview_session(current_user['id'], session_id)
+
+        # Score the answer in the background so analysis only has to aggregate
+        try:
+            scoring_queue.submit(current_user['id'], score_answer,
+                                 current_user['id'], session_id, submitted, session['job_title'])
+        except (QueueFullError, UserLimitError):
+            pass  # run_interview_analysis scores anything still missing
+
         response = {
             "success": True,
             "question_index": session['current_question_index'] - 1,
@@ -452,67 +970,172 @@ def get_interview_status(current_user, session_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def score_answer(user_id, session_id, answer_data, job_title):
+    """Score one answer and record it in the session. Runs on scoring_queue."""
+    evaluation = ai_service.evaluate_answer(answer_data['question'], answer_data['answer'], job_title)
+    if not evaluation:
+        return None
+
+    def record_score(session):
+        return {'set_item': {'answer_scores': {str(answer_data['question_index']): evaluation}}}
+
+    interview_storage.update_interview_session(user_id, session_id, record_score)
+    return evaluation
+
+def unscored_answers(session):
+    answer_scores = session.get('answer_scores', {})
+    return [answer for answer in session['answers'] if str(answer['question_index']) not in answer_scores]
+
+def wait_for_answer_scores(user_id, session):
+    """
+    Give answers still on scoring_queue up to SCORING_WAIT_SECONDS to finish.
+    Returns the most recent copy of the session.
+    """
+    deadline = time.monotonic() + SCORING_WAIT_SECONDS
+    while unscored_answers(session) and scoring_queue.pending(user_id) and time.monotonic() < deadline:
+        time.sleep(0.25)
+        session = interview_storage.get_interview_session(user_id, session['session_id']) or session
+    return session
+
+def aggregate_answer_scores(session):
+    """
+    Combine per-answer scores into an interview evaluation.
+    Answers the background scorer never finished are evaluated together in
+    one evaluate_interview call, weighted by how many answers it covers.
+    Returns None if they can't be evaluated.
+    """
+    answer_scores = session.get('answer_scores', {})
+    weighted = [
+        (answer_scores[str(answer['question_index'])], 1)
+        for answer in session['answers'] if str(answer['question_index']) in answer_scores
+    ]
+    unscored = unscored_answers(session)
+    if unscored:
+        evaluation = ai_service.evaluate_interview(
+            [{'question': answer['question'], 'answer': answer['answer']} for answer in unscored],
+            session['job_title']
+        )
+        if evaluation is None:
+            return None
+        weighted.append((evaluation, len(unscored)))
+
+    if not weighted:
+        return None
+
+    result = {}
+    for dimension in SCORE_DIMENSIONS:
+        values = [(e[dimension], weight) for e, weight in weighted if isinstance(e.get(dimension), (int, float))]
+        total_weight = sum(weight for _, weight in values)
+        result[dimension] = round(sum(v * weight for v, weight in values) / total_weight, 1) if values else 7
+
+    # Feedback on the weakest answers is the most actionable
+    ranked = sorted(
+        (e for e, _ in weighted),
+        key=lambda e: e.get('overall', 10) if isinstance(e.get('overall'), (int, float)) else 10
+    )
+    feedback = []
+    for e in ranked:
+        # evaluate_interview gives a list of points, evaluate_answer a single sentence
+        items = e.get('feedback') or []
+        feedback.extend(items if isinstance(items, list) else [items])
+    result['feedback'] = feedback[:3]
+    return result
+
+def run_interview_analysis(user_id, session):
+    """Aggregate per-answer scores and save the result. Runs on analysis_queue."""
+    session_id = session['session_id']
+    # Pick up scores recorded since the analysis was requested
+    session = interview_storage.get_interview_session(user_id, session_id) or session
+    session = wait_for_answer_scores(user_id, session)
+
+    # Prepare data for AI analysis
+    questions_answers = []
+    for answer in session['answers']:
+        questions_answers.append({
+            'question': answer['question'],
+            'answer': answer['answer']
+        })
+
+    evaluation = aggregate_answer_scores(session)
+    if not evaluation:
+        # Use fallback evaluation if AI fails
+        evaluation = {
+            "overall": 7,
+            "content": 7,
+            "delivery": 7,
+            "technical": 7,
+            "communication": 7,
+            "feedback": [
+                "Interview completed successfully",
+                "AI analysis temporarily unavailable due to high demand",
+                "Please try again later for detailed feedback"
+            ]
+        }
+
+    # Save results
+    interview_data = {
+        'interview_id': session_id,
+        'user_id': user_id,
+        'job_title': session['job_title'],
+        'questions_answers': questions_answers,
+        'scores': {
+            'overall': evaluation.get('overall', 7),
+            'content': evaluation.get('content', 7),
+            'delivery': evaluation.get('delivery', 7),
+            'technical': evaluation.get('technical', 7),
+            'communication': evaluation.get('communication', 7)
+        },
+        'feedback': evaluation.get('feedback', []),
+        'completed_at': session['completed_at']
+    }
+
+    success = interview_storage.save_interview_result(user_id, interview_data)
+    if not success:
+        raise Exception("Failed to save interview results")
+
+    return {
+        "success": True,
+        "interview_id": session_id,
+        "scores": interview_data['scores'],
+        "feedback": interview_data['feedback']
+    }
+
 @app.route('/api/interview/<session_id>/analyze', methods=['POST'])
 @token_required
 def analyze_interview(current_user, session_id):
-    """Analyze completed interview and generate results"""
+    """Queue analysis of a completed interview; poll /api/jobs/<job_id> for the result"""
     try:
         session = interview_storage.get_interview_session(current_user['id'], session_id)
         if not session or session['status'] != 'completed':
             return jsonify({"error": "Interview session not found or not completed"}), 404
 
-        # Prepare data for AI analysis
-        questions_answers = []
-        for answer in session['answers']:
-            questions_answers.append({
-                'question': answer['question'],
-                'answer': answer['answer']
-            })
-
-        # Get AI evaluation
-        evaluation = ai_service.evaluate_interview(questions_answers, session['job_title'])
-        if not evaluation:
-            # Use fallback evaluation if AI fails
-            evaluation = {
-                "overall": 7,
-                "content": 7,
-                "delivery": 7,
-                "technical": 7,
-                "communication": 7,
-                "feedback": [
-                    "Interview completed successfully",
-                    "AI analysis temporarily unavailable due to high demand",
-                    "Please try again later for detailed feedback"
-                ]
-            }
-
-        # Save results
-        interview_data = {
-            'interview_id': session_id,
-            'user_id': current_user['id'],
-            'job_title': session['job_title'],
-            'questions_answers': questions_answers,
-            'scores': {
-                'overall': evaluation.get('overall', 7),
-                'content': evaluation.get('content', 7),
-                'delivery': evaluation.get('delivery', 7),
-                'technical': evaluation.get('technical', 7),
-                'communication': evaluation.get('communication', 7)
-            },
-            'feedback': evaluation.get('feedback', []),
-            'completed_at': session['completed_at']
-        }
-
-        success = interview_storage.save_interview_result(current_user['id'], interview_data)
-        if not success:
-            return jsonify({"error": "Failed to save interview results"}), 500
+        try:
+            job_id = analysis_queue.submit(current_user['id'], run_interview_analysis, current_user['id'], session)
+        except UserLimitError as e:
+            return jsonify({"error": str(e)}), 429
+        except QueueFullError as e:
+            return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
 
         return jsonify({
             "success": True,
-            "interview_id": session_id,
-            "scores": interview_data['scores'],
-            "feedback": interview_data['feedback']
-        }), 200
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/api/jobs/{job_id}"
+        }), 202
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+@token_required
+def get_job_status(current_user, job_id):
+    """Get the status, and once finished the result, of a background job"""
+    try:
+        job = analysis_queue.get(current_user['id'], job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        return jsonify(job), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -520,29 +1143,42 @@ def analyze_interview(current_user, session_id):
 @app.route('/api/interview/history', methods=['GET'])
 @token_required
 def get_interview_history(current_user):
-    """Get user's interview history"""
+    """Get a page of the user's interview history, newest first"""
     try:
-        interviews = interview_storage.list_user_interviews(current_user['id'])
+        try:
+            limit = min(max(int(request.args.get('limit', HISTORY_PAGE_SIZE)), 1), HISTORY_MAX_PAGE_SIZE)
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
 
-        # Format for frontend
-        history = []
-        for interview in interviews:
-            history.append({
-                'interview_id': interview['interview_id'],
-                'job_title': interview['job_title'],
-                'completed_at': interview['completed_at'],
-                'overall_score': interview['scores']['overall'],
-                'scores': interview['scores']
-            })
+        try:
+            history, next_cursor = interview_storage.list_interview_summaries(
+                current_user['id'], limit, request.args.get('cursor')
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         return jsonify({
             "success": True,
-            "interviews": history
+            "interviews": history,
+            "next_cursor": next_cursor
         }), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/analytics', methods=['GET'])
+@token_required
+def get_analytics(current_user):
+    """Precomputed score statistics across all users, overall or for one job title"""
+    try:
+        job_title = request.args.get('job_title', '').strip()
+        summary = interview_storage.analytics.summary(job_title or '*')
+        summary['job_titles'] = interview_storage.analytics.job_titles()
+        return jsonify({"success": True, **summary}), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/interview/<interview_id>/results', methods=['GET'])
 @token_required
 def get_interview_results(current_user, interview_id):
@@ -571,28 +1207,125 @@ def get_interview_results(current_user, interview_id):
 @app.route('/api/stt/process', methods=['POST'])
 @token_required
 def process_speech_to_text(current_user):
-    """Process audio file to text"""
+    """
+    Transcribe a recording sent either as JSON {"audio_data": base64 or data URL}
+    or as the raw request body with an audio/* content type
+    """
     try:
-        data = request.get_json()
-        if not data or not data.get('audio_data'):
-            return jsonify({"error": "Audio data is required"}), 400
+        timer = RequestTimer()
+        with timer.phase("read"):
+            if request.is_json:
+                data = request.get_json()
+                if not data or not data.get('audio_data'):
+                    return jsonify({"error": "Audio data is required"}), 400
+
+                # Forward the client's base64 as-is; decoding it only to re-encode
+                # for Gemini would hold extra copies of the audio
+                audio_data = None
+                audio_b64, mime_type = split_data_url(data['audio_data'])
+                audio_b64 = normalize_base64(audio_b64)
+                # An empty payload ("data:audio/webm;base64,") is valid base64
+                # but decodes to no audio at all
+                if not audio_b64:
+                    return jsonify({"error": "Audio data is required"}), 400
+                if not is_base64(audio_b64):
+                    return jsonify({"error": "Invalid base64 audio data"}), 400
+            else:
+                try:
+                    spool, size = spool_stream(request.stream)
+                except AudioTooLargeError as e:
+                    return jsonify({"error": str(e)}), 413
+                if not size:
+                    return jsonify({"error": "Audio data is required"}), 400
+
+                # Raw bytes go straight to the AI service, which encodes them once
+                with spool:
+                    audio_data = spool.read()
+                audio_b64 = None
+                mime_type = request.mimetype if request.mimetype.startswith('audio/') else None
+
+        with timer.phase("transcribe"):
+            transcription = ai_service.transcribe_audio(audio_data, audio_b64=audio_b64, mime_type=mime_type)
+        if transcription is None:
+            return jsonify({"error": "Speech recognition failed"}), 500
+
+        response = jsonify({
+            "success": True,
+            "transcription": transcription,
+            "timings": {name: round(ms, 1) for name, ms in timer.timings.items()}
+        })
+        response.headers['Server-Timing'] = timer.server_timing()
+        return response, 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        # Decode base64 audio data
-        audio_b64 = data['audio_data']
-        if audio_b64.startswith('data:audio/'):
-            # Remove data URL prefix if present
-            audio_b64 = audio_b64.split(',')[1]
+@app.route('/api/stt/stream', methods=['POST'])
+@token_required
+def start_speech_stream(current_user):
+    """Start a chunked speech-to-text upload"""
+    try:
+        stream_id = transcript_streams.create(current_user['id'])
+        return jsonify({"success": True, "stream_id": stream_id}), 201
 
-        audio_data = base64.b64decode(audio_b64)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        # Process with AI service
-        transcription = ai_service.transcribe_audio(audio_data)
+@app.route('/api/stt/stream/<stream_id>/segment', methods=['POST'])
+@token_required
+def add_speech_segment(current_user, stream_id):
+    """
+    Transcribe one self-contained audio segment sent as the raw request body.
+    Clients sending segments in parallel pass ?index=N so each keeps its place.
+    """
+    try:
+        if not transcript_streams.exists(current_user['id'], stream_id):
+            return jsonify({"error": "Speech stream not found"}), 404
+
+        index = request.args.get('index', type=int)
+        if 'index' in request.args and (index is None or index < 0):
+            return jsonify({"error": "index must be a non-negative integer"}), 400
+
+        try:
+            spool, size = spool_stream(request.stream)
+        except AudioTooLargeError as e:
+            return jsonify({"error": str(e)}), 413
+        if not size:
+            return jsonify({"error": "Audio data is required"}), 400
+
+        with spool:
+            audio_b64 = b64encode_file(spool)
+        mime_type = request.mimetype if request.mimetype.startswith('audio/') else None
+
+        transcription = ai_service.transcribe_audio(audio_b64=audio_b64, mime_type=mime_type)
         if transcription is None:
             return jsonify({"error": "Speech recognition failed"}), 500
 
+        try:
+            seq = transcript_streams.add_segment(current_user['id'], stream_id, transcription, seq=index)
+        except SegmentExistsError as e:
+            return jsonify({"error": str(e)}), 409
         return jsonify({
             "success": True,
-            "transcription": transcription
+            "segment": seq,
+            "transcription": transcription,
+            "transcript": transcript_streams.transcript(current_user['id'], stream_id)
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/stt/stream/<stream_id>/finish', methods=['POST'])
+@token_required
+def finish_speech_stream(current_user, stream_id):
+    """Return the full transcript of a chunked upload and discard its state"""
+    try:
+        if not transcript_streams.exists(current_user['id'], stream_id):
+            return jsonify({"error": "Speech stream not found"}), 404
+
+        return jsonify({
+            "success": True,
+            "transcription": transcript_streams.finish(current_user['id'], stream_id)
         }), 200
 
     except Exception as e:
@@ -612,13 +1345,8 @@ def upload_resume():
         if resume_file.filename == '':
             return jsonify({"error": "No file selected"}), 400
         
-        filename = resume_file.filename.lower()
-        
-        if filename.endswith('.pdf'):
-            resume_text = extract_text_from_pdf(resume_file.read())
-        elif filename.endswith(('.txt', '.doc', '.docx')):
-            resume_text = resume_file.read().decode('utf-8', errors='ignore')
-        else:
+        resume_text = extract_resume_text(resume_file.filename, resume_file.stream)
+        if resume_text is None:
             return jsonify({"error": "Unsupported file format. Please upload PDF or TXT file"}), 400
         
         if not resume_text.strip():
@@ -634,6 +1362,8 @@ def upload_resume():
             "text_length": len(resume_text)
         }), 200
         
+    except ResumeLimitError as e:
+        return jsonify({"error": str(e)}), 413
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -655,7 +1385,7 @@ def generate_questions():
         if not job_title:
             return jsonify({"error": "Job title is required"}), 400
         
-        resume_text = get_resume_by_name(name)
+        resume_text = get_resume_by_name(name, max_chars=RESUME_PROMPT_CHARS)
         
         if not resume_text:
             return jsonify({
@@ -676,42 +1406,56 @@ def generate_questions():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-# STT/TTS API endpoints
-@app.route('/api/stt/process', methods=['POST'])
-@token_required
-def process_speech(current_user):
-    """Process speech audio and return transcription"""
+def _sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/generate-questions/stream', methods=['POST'])
+def generate_questions_stream():
+    """Stream generated questions as server-sent events, one per completed line"""
     try:
         data = request.get_json()
-        if not data or not data.get('audio_data'):
-            return jsonify({"error": "Audio data is required"}), 400
+        
+        if not data:
+            return jsonify({"error": "Request body is required"}), 400
+        
+        name = data.get('name')
+        job_title = data.get('job_title')
+        num_questions = data.get('num_questions', 5)
+        
+        if not name:
+            return jsonify({"error": "Name is required"}), 400
+        
+        if not job_title:
+            return jsonify({"error": "Job title is required"}), 400
+        
+        resume_text = get_resume_by_name(name, max_chars=RESUME_PROMPT_CHARS)
+        
+        if not resume_text:
+            return jsonify({
+                "error": f"No resume found for name: {name}",
+                "suggestion": "Please upload resume first using /api/upload-resume"
+            }), 404
 
-        # Extract base64 audio data
-        audio_data_str = data['audio_data']
-        if ',' in audio_data_str:
-            # Handle data URL format: "data:audio/webm;base64,<base64data>"
-            audio_b64 = audio_data_str.split(',')[1]
-        else:
-            audio_b64 = audio_data_str
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        # Decode base64 to bytes
+    def events():
+        count = 0
         try:
-            audio_bytes = base64.b64decode(audio_b64)
+            for question in iter_questions(stream_question_text(resume_text, job_title, num_questions)):
+                # Keep reading past the limit so the full response gets cached
+                if count < num_questions:
+                    yield _sse_event("question", {"index": count, "question": question})
+                    count += 1
+            yield _sse_event("done", {"total_questions": count})
         except Exception as e:
-            return jsonify({"error": f"Invalid base64 audio data: {str(e)}"}), 400
-
-        # Transcribe audio
-        transcription = ai_service.transcribe_audio(audio_bytes)
-        if transcription is None:
-            return jsonify({"error": "Speech recognition failed"}), 500
+            yield _sse_event("error", {"error": f"Error generating questions with Groq: {str(e)}"})
 
-        return jsonify({
-            "success": True,
-            "transcription": transcription
-        }), 200
-
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 if __name__ == '__main__':
     initialize_qdrant()
@@ -0,0 +1,145 @@
+import os
+import time
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# werkzeug method string, including its cost parameters,
+# e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:600000"
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+PASSWORD_SALT_LENGTH = int(os.getenv("PASSWORD_SALT_LENGTH", 16))
+# Workers are started from a clean server process, never forked from a
+# threaded web worker, which could copy held locks into the child
+PASSWORD_START_METHOD = os.getenv("PASSWORD_START_METHOD", "forkserver")
+
+
+class PasswordPoolBusyError(Exception):
+    """Raised when password work can't be queued or doesn't finish in time."""
+
+
+def _hash(password: str, method: str, salt_length: int) -> str:
+    return generate_password_hash(password, method=method, salt_length=salt_length)
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a small process pool, so a
+    burst of logins uses at most `workers` cores and never blocks a request
+    thread for longer than `timeout`. At most `max_pending` calls wait for a
+    free worker; beyond that, calls fail fast with PasswordPoolBusyError.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 32, timeout: float = 10.0,
+                 method: str = PASSWORD_HASH_METHOD, salt_length: int = PASSWORD_SALT_LENGTH,
+                 start_method: str = PASSWORD_START_METHOD, latency_window: int = 1000):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.method = method
+        self.salt_length = salt_length
+        self.start_method = start_method
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        # Metrics
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._latencies = deque(maxlen=latency_window)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Create the pool on first use, so forked gunicorn workers get their own."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        """Shut down a broken pool so its processes are reaped; the next call starts a fresh one."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _future):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolBusyError("Too many password requests in progress, please retry shortly")
+
+        started = time.monotonic()
+        pool = self._get_pool()
+        try:
+            future = pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next call
+            self._discard_pool(pool)
+            self._slots.release()
+            raise PasswordPoolBusyError("Password service restarting, please retry shortly")
+        with self._lock:
+            self.in_flight += 1
+        # The slot is held until the work finishes, even if the caller gives up waiting
+        future.add_done_callback(self._release)
+
+        try:
+            result = future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise PasswordPoolBusyError("Password request timed out, please retry shortly")
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            raise PasswordPoolBusyError("Password service restarting, please retry shortly")
+
+        with self._lock:
+            self.completed += 1
+            self._latencies.append(time.monotonic() - started)
+        return result
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password, self.method, self.salt_length)
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        return self._run(check_password_hash, pwhash, password)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self._latencies)
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "method": self.method.split(':')[0],
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "latency_seconds": {
+                    "p50": ordered[len(ordered) // 2] if ordered else 0.0,
+                    "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0,
+                    "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else 0.0
+                }
+            }
+
+
+# Global password hasher
+password_hasher = PasswordHasher(
+    workers=int(os.getenv("PASSWORD_WORKERS", 2)),
+    max_pending=int(os.getenv("PASSWORD_MAX_PENDING", 32)),
+    timeout=float(os.getenv("PASSWORD_TIMEOUT", 10))
+)
@@ -1,21 +1,108 @@
 import os
+import sys
+import copy
 import json
+import base64
+import argparse
+import sqlite3
+import time
 import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
+from collections import OrderedDict
+import tempfile
 import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONSerializer:
+    """JSON documents; indented for reading by hand, or compact. Uses orjson when installed."""
+    extension = '.json'
+
+    def __init__(self, indent: bool = False):
+        self.indent = indent
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if self.indent else 0)
+        if self.indent:
+            return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def loads(self, raw: bytes) -> Dict[str, Any]:
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
+
+
+class MsgpackSerializer:
+    """MessagePack documents, smaller and faster to encode and decode than JSON."""
+    extension = '.msgpack'
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, raw: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(raw, raw=False)
+
+
+SERIALIZERS = {
+    "json-pretty": lambda: JSONSerializer(indent=True),
+    "json": lambda: JSONSerializer(),
+    "msgpack": MsgpackSerializer,
+}
+
+
+def get_serializer(name: str):
+    """Build the serializer for a STORAGE_FORMAT name, falling back to compact JSON if msgpack is missing."""
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown storage format: {name}")
+    if name == "msgpack" and msgpack is None:
+        print("STORAGE_FORMAT=msgpack but msgpack is not installed (see requirements.txt); "
+              "storing compact JSON instead")
+        name = "json"
+    return SERIALIZERS[name]()
+
 
 class SimpleStorage:
     """
-    Simple JSON file-based storage system for user interview data.
-    Each user gets their own directory with JSON files for different data types.
+    Simple file-based storage system for user interview data.
+    Each user gets their own directory with one file per document. Documents
+    are written in the configured format (STORAGE_FORMAT: json-pretty, json or
+    msgpack) and files in any of the formats are read, so switching format
+    doesn't strand existing data.
     """
 
-    def __init__(self, base_dir: Optional[str] = None):
+    def __init__(self, base_dir: Optional[str] = None, lock_stripes: int = 64,
+                 serializer: Optional[str] = None):
         # Default to Vercel writable temp folder
         if base_dir is None:
-            base_dir = "/tmp/user_data"
+            base_dir = os.getenv("STORAGE_DIR", "/tmp/user_data")
         self.base_dir = base_dir
-        self._lock = threading.Lock()
+        self.serializer = get_serializer(serializer or os.getenv("STORAGE_FORMAT", "json-pretty"))
+        # The configured format is tried first when reading
+        self._readers = {self.serializer.extension: self.serializer}
+        self._readers.setdefault(JSONSerializer.extension, JSONSerializer())
+        if msgpack is not None:
+            self._readers.setdefault(MsgpackSerializer.extension, MsgpackSerializer())
+        # Writes for different users proceed in parallel; a user's writes are
+        # serialised by their stripe here and by a flock across processes
+        self._locks = [threading.Lock() for _ in range(lock_stripes)]
         self._ensure_base_directory()
 
     def _ensure_base_directory(self):
@@ -34,25 +121,89 @@ class SimpleStorage:
         """Get the full path for a user's data file."""
         return os.path.join(self._get_user_dir(user_id), filename)
 
+    def _base_name(self, filename: str) -> str:
+        """Strip a format extension; callers may pass 'name' or 'name.json'."""
+        for extension in (JSONSerializer.extension, MsgpackSerializer.extension):
+            if filename.endswith(extension):
+                return filename[:-len(extension)]
+        return filename
+
+    def _find_file(self, user_id: str, filename: str):
+        """Return (path, serializer) of an existing document in any readable format, or (None, None)."""
+        name = self._base_name(filename)
+        for extension, serializer in self._readers.items():
+            file_path = self._get_file_path(user_id, name + extension)
+            if os.path.exists(file_path):
+                return file_path, serializer
+        return None, None
+
+    def document_version(self, user_id: str, filename: str):
+        """Return a value that changes whenever the document is rewritten, or None if it doesn't exist."""
+        file_path, _ = self._find_file(user_id, filename)
+        if file_path is None:
+            return None
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        # Atomic saves replace the inode, so this changes on every write
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    @contextmanager
+    def _user_lock(self, user_id: str):
+        """Hold the user's lock stripe and, where available, their advisory file lock."""
+        with self._locks[hash(user_id) % len(self._locks)]:
+            if not fcntl:
+                yield
+                return
+            with open(self._get_file_path(user_id, '.lock'), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_atomic(self, file_path: str, data: Dict[str, Any]):
+        """Write to a temp file in the same directory, fsync it and rename it over file_path."""
+        raw = self.serializer.dumps(data)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix='.tmp_')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
     def save_user_data(self, user_id: str, filename: str, data: Dict[str, Any]) -> bool:
-        """Save data to a user's JSON file."""
-        try:
-            with self._lock:
-                self._ensure_user_directory(user_id)
-                if not filename.endswith('.json'):
-                    filename = f"{filename}.json"
-                file_path = self._get_file_path(user_id, filename)
-
-                data_with_meta = {
-                    **data,
-                    "_metadata": {
-                        "last_updated": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-                        "version": "1.0"
-                    }
+        """Save data to a user's file. Readers see the old or the new file, never a partial one."""
+        try:
+            self._ensure_user_directory(user_id)
+            name = self._base_name(filename)
+            file_path = self._get_file_path(user_id, name + self.serializer.extension)
+
+            data_with_meta = {
+                **data,
+                "_metadata": {
+                    "last_updated": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "version": "1.0"
                 }
+            }
 
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data_with_meta, f, indent=2, ensure_ascii=False)
+            with self._user_lock(user_id):
+                self._write_atomic(file_path, data_with_meta)
+                # Drop any copy in a previous format so reads can't find stale data
+                for extension in self._readers:
+                    if extension != self.serializer.extension:
+                        try:
+                            os.remove(self._get_file_path(user_id, name + extension))
+                        except FileNotFoundError:
+                            pass
 
             return True
         except Exception as e:
@@ -60,16 +211,14 @@ class SimpleStorage:
             return False
 
     def load_user_data(self, user_id: str, filename: str) -> Optional[Dict[str, Any]]:
-        """Load data from a user's JSON file."""
+        """Load data from a user's file, whichever format it was written in."""
         try:
-            if not filename.endswith('.json'):
-                filename = f"{filename}.json"
-            file_path = self._get_file_path(user_id, filename)
-            if not os.path.exists(file_path):
+            file_path, serializer = self._find_file(user_id, filename)
+            if file_path is None:
                 return None
 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                return serializer.loads(f.read())
         except Exception as e:
             print(f"Error loading user data: {e}")
             return None
@@ -81,19 +230,32 @@ class SimpleStorage:
             if not os.path.exists(user_dir):
                 return []
 
-            return [f[:-5] for f in os.listdir(user_dir) if f.endswith('.json')]
+            names = set()
+            for f in os.listdir(user_dir):
+                name, extension = os.path.splitext(f)
+                if extension in self._readers:
+                    names.add(name)
+            return list(names)
         except Exception as e:
             print(f"Error listing user files: {e}")
             return []
 
+    def list_users(self) -> List[str]:
+        """List every user with a data directory."""
+        try:
+            return [name for name in os.listdir(self.base_dir) if os.path.isdir(self._get_user_dir(name))]
+        except Exception as e:
+            print(f"Error listing users: {e}")
+            return []
+
     def delete_user_data(self, user_id: str, filename: str) -> bool:
-        """Delete a user's data file."""
+        """Delete a user's data file, in every format it exists in."""
         try:
-            if not filename.endswith('.json'):
-                filename = f"{filename}.json"
-            file_path = self._get_file_path(user_id, filename)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            name = self._base_name(filename)
+            for extension in self._readers:
+                file_path = self._get_file_path(user_id, name + extension)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
             return True
         except Exception as e:
             print(f"Error deleting user data: {e}")
@@ -112,8 +274,767 @@ class SimpleStorage:
             return False
 
 
+def _sqlite_connection(local: threading.local, db_path: str) -> sqlite3.Connection:
+    """One connection per thread; WAL lets gunicorn workers read while another writes."""
+    conn = getattr(local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        local.conn = conn
+    return conn
+
+
+class SQLiteStorage:
+    """
+    SimpleStorage-compatible storage kept in a single SQLite database.
+    Each document is one row, with user_id, type (the filename prefix, e.g.
+    'interview') and completed_at pulled out into indexed columns. Files
+    that belong next to documents, such as session logs, live under
+    base_dir/<user_id> as before.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, serializer: Optional[str] = None):
+        if db_path is None:
+            db_path = os.getenv("STORAGE_DB_PATH", "/tmp/user_data/storage.sqlite3")
+        self.db_path = db_path
+        self.base_dir = os.path.dirname(db_path) or "."
+        self.serializer = get_serializer(serializer or os.getenv("STORAGE_FORMAT", "json"))
+        self._readers = {JSONSerializer.extension: JSONSerializer()}
+        if msgpack is not None:
+            self._readers[MsgpackSerializer.extension] = MsgpackSerializer()
+        self._readers[self.serializer.extension] = self.serializer
+        self._local = threading.local()
+        os.makedirs(self.base_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    user_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    completed_at TEXT,
+                    format TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 1,
+                    PRIMARY KEY (user_id, name)
+                );
+                CREATE INDEX IF NOT EXISTS documents_by_type
+                    ON documents (user_id, type, completed_at);
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return _sqlite_connection(self._local, self.db_path)
+
+    def _get_user_dir(self, user_id: str) -> str:
+        return os.path.join(self.base_dir, user_id)
+
+    def _ensure_user_directory(self, user_id: str):
+        os.makedirs(self._get_user_dir(user_id), exist_ok=True)
+
+    def _get_file_path(self, user_id: str, filename: str) -> str:
+        return os.path.join(self._get_user_dir(user_id), filename)
+
+    @staticmethod
+    def _name(filename: str) -> str:
+        for extension in (JSONSerializer.extension, MsgpackSerializer.extension):
+            if filename.endswith(extension):
+                return filename[:-len(extension)]
+        return filename
+
+    def _row(self, user_id: str, name: str, data: Dict[str, Any], serializer) -> tuple:
+        completed_at = data.get('completed_at')
+        return (
+            user_id, name, name.split('_', 1)[0],
+            completed_at if isinstance(completed_at, str) else None,
+            serializer.extension, serializer.dumps(data)
+        )
+
+    def import_documents(self, user_id: str, documents: List[tuple]) -> int:
+        """Insert (filename, data) pairs as-is, in one transaction. Used by migrations."""
+        rows = [self._row(user_id, self._name(filename), data, self.serializer) for filename, data in documents]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO documents (user_id, name, type, completed_at, format, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def save_user_data(self, user_id: str, filename: str, data: Dict[str, Any]) -> bool:
+        """Save a user's document."""
+        try:
+            data_with_meta = {
+                **data,
+                "_metadata": {
+                    "last_updated": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "version": "1.0"
+                }
+            }
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO documents (user_id, name, type, completed_at, format, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (user_id, name) DO UPDATE SET "
+                    "type = excluded.type, completed_at = excluded.completed_at, format = excluded.format, "
+                    "data = excluded.data, version = documents.version + 1",
+                    self._row(user_id, self._name(filename), data_with_meta, self.serializer)
+                )
+            return True
+        except Exception as e:
+            print(f"Error saving user data: {e}")
+            return False
+
+    def load_user_data(self, user_id: str, filename: str) -> Optional[Dict[str, Any]]:
+        """Load a user's document, whichever format it was written in."""
+        try:
+            row = self._connect().execute(
+                "SELECT format, data FROM documents WHERE user_id = ? AND name = ?",
+                (user_id, self._name(filename))
+            ).fetchone()
+            if row is None:
+                return None
+            return self._readers[row[0]].loads(row[1])
+        except Exception as e:
+            print(f"Error loading user data: {e}")
+            return None
+
+    def document_version(self, user_id: str, filename: str):
+        """Return a value that changes whenever the document is rewritten, or None if it doesn't exist."""
+        row = self._connect().execute(
+            "SELECT version FROM documents WHERE user_id = ? AND name = ?",
+            (user_id, self._name(filename))
+        ).fetchone()
+        return row[0] if row else None
+
+    def list_user_files(self, user_id: str) -> List[str]:
+        """List all document names for a user."""
+        try:
+            rows = self._connect().execute("SELECT name FROM documents WHERE user_id = ?", (user_id,))
+            return [name for name, in rows]
+        except Exception as e:
+            print(f"Error listing user files: {e}")
+            return []
+
+    def list_users(self) -> List[str]:
+        """List every user with at least one document."""
+        try:
+            return [user_id for user_id, in self._connect().execute("SELECT DISTINCT user_id FROM documents")]
+        except Exception as e:
+            print(f"Error listing users: {e}")
+            return []
+
+    def delete_user_data(self, user_id: str, filename: str) -> bool:
+        """Delete a user's document."""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM documents WHERE user_id = ? AND name = ?",
+                             (user_id, self._name(filename)))
+            return True
+        except Exception as e:
+            print(f"Error deleting user data: {e}")
+            return False
+
+    def delete_user_directory(self, user_id: str) -> bool:
+        """Delete all data for a user."""
+        try:
+            import shutil
+            with self._connect() as conn:
+                conn.execute("DELETE FROM documents WHERE user_id = ?", (user_id,))
+            user_dir = self._get_user_dir(user_id)
+            if os.path.exists(user_dir):
+                shutil.rmtree(user_dir)
+            return True
+        except Exception as e:
+            print(f"Error deleting user directory: {e}")
+            return False
+
+
+def create_storage():
+    """Build the storage backend named by STORAGE_BACKEND ('file' or 'sqlite')."""
+    backend = os.getenv("STORAGE_BACKEND", "file")
+    if backend == "sqlite":
+        return SQLiteStorage()
+    if backend != "file":
+        raise ValueError(f"Unknown storage backend: {backend}")
+    return SimpleStorage()
+
+
+def migrate_to_sqlite(source_dir: str, target: SQLiteStorage) -> int:
+    """
+    Import every user directory under source_dir into target. Pending session
+    logs are folded into their snapshots first, so no answers are lost and
+    nothing is replayed twice if target shares the directory.
+    Returns the number of documents imported.
+    """
+    source = SimpleStorage(source_dir)
+    sessions = SessionCache(source)
+    total = 0
+    for user_id in sorted(os.listdir(source_dir)):
+        if not os.path.isdir(source._get_user_dir(user_id)):
+            continue
+        documents = []
+        for name in source.list_user_files(user_id):
+            if name.startswith('session_'):
+                session_id = name[len('session_'):]
+                sessions.get(user_id, session_id)
+                sessions.flush(user_id, session_id)
+            data = source.load_user_data(user_id, name)
+            if data is not None:
+                documents.append((name, data))
+        total += target.import_documents(user_id, documents)
+        print(f"{user_id}: {len(documents)} documents")
+    return total
+
+
 # Global storage instance
-storage = SimpleStorage()
+storage = create_storage()
+
+class _CachedSession:
+    __slots__ = ('lock', 'session', 'snapshot_id', 'offset', 'pending')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.session: Optional[Dict[str, Any]] = None
+        self.snapshot_id = None
+        self.offset = 0
+        self.pending = 0
+
+
+class SessionCache:
+    """
+    Write-behind cache for interview sessions.
+
+    Updates are expressed as patches, appended (and fsync'd) to
+    session_<id>.log next to the session_<id> snapshot and applied to the
+    cached copy, so an update costs the same however large the session is.
+    A background thread periodically folds the log into the snapshot, which
+    coalesces many updates into one rewrite. The log is flock'd and every
+    access replays entries appended by other gunicorn workers.
+
+    A patch is a dict of any of:
+        {"set": {key: value}, "append": {key: item}, "set_item": {key: {subkey: value}}}
+
+    Log records carry increasing sequence numbers and the session stores the
+    last one applied (_log_seq), so records already folded into a snapshot
+    are skipped if a crash leaves them in the log.
+
+    get and update return a shallow copy: nested lists and dicts are shared
+    with the cache and must be treated as read-only.
+    """
+
+    def __init__(self, storage, flush_interval: float = 5.0, max_entries: int = 1000):
+        self.storage = storage
+        self.flush_interval = flush_interval
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, _CachedSession]" = OrderedDict()
+        self._guard = threading.Lock()
+        self._flusher = None
+
+        # Metrics
+        self.appends = 0
+        self.flushes = 0
+        self.reloads = 0
+
+    @staticmethod
+    def apply_patch(session: Dict[str, Any], patch: Dict[str, Any]):
+        session.update(patch.get('set', {}))
+        for key, item in patch.get('append', {}).items():
+            session.setdefault(key, []).append(item)
+        for key, items in patch.get('set_item', {}).items():
+            # Replaced rather than updated, so a reader iterating a shared
+            # copy never sees the dict change size
+            session[key] = {**session.get(key, {}), **items}
+
+    @classmethod
+    def apply_record(cls, session: Dict[str, Any], record: Dict[str, Any]):
+        """Apply one log record unless the session already contains it."""
+        if 'seq' not in record:
+            # Written before records were sequenced
+            cls.apply_patch(session, record)
+            return
+        if record['seq'] <= session.get('_log_seq', 0):
+            return
+        cls.apply_patch(session, record['patch'])
+        session['_log_seq'] = record['seq']
+
+    def _log_path(self, user_id: str, session_id: str) -> str:
+        return self.storage._get_file_path(user_id, f"session_{session_id}.log")
+
+    def _snapshot_version(self, user_id: str, session_id: str):
+        return self.storage.document_version(user_id, f"session_{session_id}")
+
+    def _entry(self, user_id: str, session_id: str) -> _CachedSession:
+        with self._guard:
+            self._ensure_flusher()
+            key = (user_id, session_id)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _CachedSession()
+                self._evict()
+            else:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _evict(self):
+        # Only sessions whose log is folded into the snapshot can be dropped
+        for key in list(self._entries):
+            if len(self._entries) <= self.max_entries:
+                break
+            entry = self._entries[key]
+            if not entry.pending and not entry.lock.locked():
+                del self._entries[key]
+
+    def _ensure_flusher(self):
+        """Start the flush thread on first use, so forked gunicorn workers get their own."""
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="session-flush", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            with self._guard:
+                dirty = [key for key, entry in self._entries.items() if entry.pending]
+            for user_id, session_id in dirty:
+                self.flush(user_id, session_id)
+
+    def _refresh(self, entry: _CachedSession, user_id: str, session_id: str):
+        """Bring the cached session up to date with the files. Caller holds entry.lock and the log's flock."""
+        log = self._log_path(user_id, session_id)
+        snapshot_id = self._snapshot_version(user_id, session_id)
+        if snapshot_id is None:
+            entry.session, entry.snapshot_id, entry.offset, entry.pending = None, None, 0, 0
+            return
+
+        if snapshot_id != entry.snapshot_id:
+            # New snapshot (first load, or another worker flushed): it already
+            # contains everything logged before it, so replay from the start
+            entry.session = self.storage.load_user_data(user_id, f"session_{session_id}")
+            entry.snapshot_id = snapshot_id
+            entry.offset = 0
+            entry.pending = 0
+            self.reloads += 1
+
+        try:
+            if os.path.getsize(log) <= entry.offset:
+                return
+        except FileNotFoundError:
+            return
+        with open(log, 'rb') as f:
+            f.seek(entry.offset)
+            for line in f:
+                # A partially written tail is picked up on the next refresh
+                if not line.endswith(b'\n'):
+                    break
+                entry.offset += len(line)
+                entry.pending += 1
+                try:
+                    self.apply_record(entry.session, json.loads(line))
+                except (ValueError, AttributeError, KeyError) as e:
+                    print(f"Skipping corrupt session log entry: {e}")
+
+    def _open_log(self, user_id: str, session_id: str, exclusive: bool):
+        self.storage._ensure_user_directory(user_id)
+        f = open(self._log_path(user_id, session_id), 'ab')
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        return f
+
+    def get(self, user_id: str, session_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entry(user_id, session_id)
+        with entry.lock:
+            if self._snapshot_version(user_id, session_id) is None:
+                entry.session = None
+                return None
+            with self._open_log(user_id, session_id, exclusive=False):
+                self._refresh(entry, user_id, session_id)
+            return dict(entry.session) if entry.session is not None else None
+
+    def update(self, user_id: str, session_id: str,
+               make_patch: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Log and apply make_patch(session). make_patch must not modify the session.
+        Returns a shallow copy of the updated session, or None if it doesn't
+        exist or the update can't be logged.
+        """
+        entry = self._entry(user_id, session_id)
+        with entry.lock:
+            if self._snapshot_version(user_id, session_id) is None:
+                return None
+            with self._open_log(user_id, session_id, exclusive=True) as f:
+                self._refresh(entry, user_id, session_id)
+                if entry.session is None:
+                    return None
+                record = {'seq': entry.session.get('_log_seq', 0) + 1, 'patch': make_patch(entry.session)}
+                line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+                try:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                except OSError as e:
+                    print(f"Error logging session update: {e}")
+                    return None
+                self.apply_record(entry.session, record)
+                entry.offset += len(line)
+                entry.pending += 1
+                self.appends += 1
+            return dict(entry.session)
+
+    def _write_snapshot(self, entry: _CachedSession, user_id: str, session_id: str, f) -> bool:
+        """
+        Save the cached session and empty the log. Caller holds the log's exclusive flock.
+        A crash between the two steps is harmless: the snapshot's _log_seq
+        makes the leftover records no-ops.
+        """
+        if not self.storage.save_user_data(user_id, f"session_{session_id}", entry.session):
+            return False
+        f.truncate(0)
+        entry.snapshot_id = self._snapshot_version(user_id, session_id)
+        entry.offset = 0
+        entry.pending = 0
+        self.flushes += 1
+        return True
+
+    def save(self, user_id: str, session: Dict[str, Any]) -> bool:
+        """Replace a session outright, discarding any logged updates."""
+        session_id = session.get('session_id', 'active')
+        entry = self._entry(user_id, session_id)
+        with entry.lock:
+            with self._open_log(user_id, session_id, exclusive=True) as f:
+                self._refresh(entry, user_id, session_id)
+                # Keep the sequence going so records of the replaced session stay skipped
+                last_seq = entry.session.get('_log_seq', 0) if entry.session else 0
+                entry.session = copy.deepcopy(session)
+                entry.session['_log_seq'] = last_seq
+                return self._write_snapshot(entry, user_id, session_id, f)
+
+    def flush(self, user_id: str, session_id: str) -> bool:
+        """Fold a session's log into its snapshot."""
+        entry = self._entry(user_id, session_id)
+        try:
+            with entry.lock:
+                if not entry.pending:
+                    return True
+                with self._open_log(user_id, session_id, exclusive=True) as f:
+                    # Include entries other workers appended since our last read
+                    self._refresh(entry, user_id, session_id)
+                    if entry.session is None or not entry.pending:
+                        return entry.session is not None
+                    return self._write_snapshot(entry, user_id, session_id, f)
+        except Exception as e:
+            print(f"Error flushing interview session: {e}")
+            return False
+
+    def delete(self, user_id: str, session_id: str) -> bool:
+        entry = self._entry(user_id, session_id)
+        with entry.lock:
+            ok = self.storage.delete_user_data(user_id, f"session_{session_id}")
+            try:
+                os.remove(self._log_path(user_id, session_id))
+            except FileNotFoundError:
+                pass
+            entry.session, entry.snapshot_id, entry.offset, entry.pending = None, None, 0, 0
+        with self._guard:
+            self._entries.pop((user_id, session_id), None)
+        return ok
+
+    def stats(self) -> Dict[str, Any]:
+        with self._guard:
+            return {
+                "entries": len(self._entries),
+                "dirty": sum(1 for entry in self._entries.values() if entry.pending),
+                "appends": self.appends,
+                "flushes": self.flushes,
+                "reloads": self.reloads
+            }
+
+
+class InterviewIndex:
+    """
+    SQLite table of interview summaries (id, job title, completion time and
+    scores), so history pages are served without opening result documents.
+    Pages are keyset-paginated on (completed_at, interview_id), newest first.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS interview_index (
+                    user_id TEXT NOT NULL,
+                    interview_id TEXT NOT NULL,
+                    job_title TEXT,
+                    completed_at TEXT NOT NULL,
+                    scores TEXT NOT NULL,
+                    PRIMARY KEY (user_id, interview_id)
+                );
+                CREATE INDEX IF NOT EXISTS interview_index_by_date
+                    ON interview_index (user_id, completed_at DESC, interview_id DESC);
+                CREATE TABLE IF NOT EXISTS indexed_users (user_id TEXT PRIMARY KEY);
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return _sqlite_connection(self._local, self.db_path)
+
+    @staticmethod
+    def summarize(interview: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'interview_id': interview['interview_id'],
+            'job_title': interview.get('job_title'),
+            'completed_at': interview.get('completed_at', ''),
+            'overall_score': interview.get('scores', {}).get('overall'),
+            'scores': interview.get('scores', {})
+        }
+
+    def _upsert(self, conn: sqlite3.Connection, user_id: str, summary: Dict[str, Any]):
+        conn.execute(
+            "INSERT OR REPLACE INTO interview_index VALUES (?, ?, ?, ?, ?)",
+            (user_id, summary['interview_id'], summary['job_title'],
+             summary['completed_at'], json.dumps(summary['scores']))
+        )
+
+    def add(self, user_id: str, interview: Dict[str, Any]):
+        with self._connect() as conn:
+            self._upsert(conn, user_id, self.summarize(interview))
+
+    def remove(self, user_id: str, interview_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM interview_index WHERE user_id = ? AND interview_id = ?",
+                         (user_id, interview_id))
+
+    def is_indexed(self, user_id: str) -> bool:
+        row = self._connect().execute("SELECT 1 FROM indexed_users WHERE user_id = ?", (user_id,)).fetchone()
+        return row is not None
+
+    def backfill(self, user_id: str, interviews: List[Dict[str, Any]]):
+        """Index a user's existing results in one transaction and mark them as indexed."""
+        with self._connect() as conn:
+            for interview in interviews:
+                self._upsert(conn, user_id, self.summarize(interview))
+            conn.execute("INSERT OR IGNORE INTO indexed_users VALUES (?)", (user_id,))
+
+    @staticmethod
+    def encode_cursor(summary: Dict[str, Any]) -> str:
+        raw = json.dumps([summary['completed_at'], summary['interview_id']]).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        """Return (completed_at, interview_id); raises ValueError for a malformed cursor."""
+        try:
+            completed_at, interview_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except Exception:
+            raise ValueError("Invalid cursor")
+        return str(completed_at), str(interview_id)
+
+    def page(self, user_id: str, limit: int, cursor: Optional[str] = None):
+        """Return (summaries, next cursor or None), newest first."""
+        query = "SELECT interview_id, job_title, completed_at, scores FROM interview_index WHERE user_id = ?"
+        params: List[Any] = [user_id]
+        if cursor:
+            completed_at, interview_id = self.decode_cursor(cursor)
+            query += " AND (completed_at < ? OR (completed_at = ? AND interview_id < ?))"
+            params += [completed_at, completed_at, interview_id]
+        query += " ORDER BY completed_at DESC, interview_id DESC LIMIT ?"
+        # One extra row tells us whether there is a next page
+        params.append(limit + 1)
+
+        rows = self._connect().execute(query, params).fetchall()
+        summaries = []
+        for interview_id, job_title, completed_at, scores in rows[:limit]:
+            scores = json.loads(scores)
+            summaries.append({
+                'interview_id': interview_id,
+                'job_title': job_title,
+                'completed_at': completed_at,
+                'overall_score': scores.get('overall'),
+                'scores': scores
+            })
+        next_cursor = self.encode_cursor(summaries[-1]) if len(rows) > limit else None
+        return summaries, next_cursor
+
+
+SCORE_DIMENSIONS = ('overall', 'content', 'delivery', 'technical', 'communication')
+# Scores run 1-10; histograms use half-point buckets 0..20
+HISTOGRAM_BUCKETS = 21
+ALL_JOB_TITLES = '*'
+
+
+class InterviewAnalytics:
+    """
+    Running score statistics over every saved interview result, per job title
+    and for all titles together ('*'). Each result's contribution is stored,
+    so re-saving a result replaces its old scores instead of counting twice,
+    and reads never touch result documents.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS analytics_contributions (
+                    user_id TEXT NOT NULL,
+                    interview_id TEXT NOT NULL,
+                    job_title TEXT NOT NULL,
+                    scores TEXT NOT NULL,
+                    PRIMARY KEY (user_id, interview_id)
+                );
+                CREATE TABLE IF NOT EXISTS analytics_stats (
+                    job_title TEXT NOT NULL,
+                    dimension TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    total REAL NOT NULL,
+                    total_sq REAL NOT NULL,
+                    PRIMARY KEY (job_title, dimension)
+                );
+                CREATE TABLE IF NOT EXISTS analytics_histogram (
+                    job_title TEXT NOT NULL,
+                    dimension TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (job_title, dimension, bucket)
+                );
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return _sqlite_connection(self._local, self.db_path)
+
+    @staticmethod
+    def contribution(interview: Dict[str, Any]):
+        """Return (job title, {dimension: score}) for the numeric scores of a result."""
+        job_title = (interview.get('job_title') or 'Unknown').strip() or 'Unknown'
+        scores = {
+            dimension: float(value) for dimension, value in interview.get('scores', {}).items()
+            if dimension in SCORE_DIMENSIONS and isinstance(value, (int, float))
+        }
+        return job_title, scores
+
+    @staticmethod
+    def _bucket(score: float) -> int:
+        return min(max(int(score * 2), 0), HISTOGRAM_BUCKETS - 1)
+
+    def _apply(self, conn: sqlite3.Connection, job_title: str, scores: Dict[str, float], sign: int):
+        for title in (job_title, ALL_JOB_TITLES):
+            for dimension, score in scores.items():
+                conn.execute(
+                    "INSERT INTO analytics_stats VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (job_title, dimension) DO UPDATE SET count = count + excluded.count, "
+                    "total = total + excluded.total, total_sq = total_sq + excluded.total_sq",
+                    (title, dimension, sign, sign * score, sign * score * score)
+                )
+                conn.execute(
+                    "INSERT INTO analytics_histogram VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (job_title, dimension, bucket) DO UPDATE SET count = count + excluded.count",
+                    (title, dimension, self._bucket(score), sign)
+                )
+
+    def record(self, user_id: str, interview: Dict[str, Any]):
+        """Add a result's scores, replacing its previous contribution if it was saved before."""
+        job_title, scores = self.contribution(interview)
+        conn = self._connect()
+        # IMMEDIATE takes the write lock up front, so two workers can't both
+        # read the old contribution and subtract it twice
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT job_title, scores FROM analytics_contributions WHERE user_id = ? AND interview_id = ?",
+                (user_id, interview['interview_id'])
+            ).fetchone()
+            if row is not None:
+                self._apply(conn, row[0], json.loads(row[1]), -1)
+            self._apply(conn, job_title, scores, 1)
+            conn.execute(
+                "INSERT OR REPLACE INTO analytics_contributions VALUES (?, ?, ?, ?)",
+                (user_id, interview['interview_id'], job_title, json.dumps(scores))
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def rebuild(self, contributions: List[tuple]):
+        """Replace all statistics with (user_id, interview_id, job_title, scores) contributions."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table in ('analytics_contributions', 'analytics_stats', 'analytics_histogram'):
+                conn.execute(f"DELETE FROM {table}")
+            for user_id, interview_id, job_title, scores in contributions:
+                self._apply(conn, job_title, scores, 1)
+                conn.execute(
+                    "INSERT OR REPLACE INTO analytics_contributions VALUES (?, ?, ?, ?)",
+                    (user_id, interview_id, job_title, json.dumps(scores))
+                )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _percentile(histogram: List[int], count: int, fraction: float) -> Optional[float]:
+        """
+        Approximate a percentile as the lower edge of the bucket it falls in.
+        Buckets are half a point wide, so whole and half-point scores come out exact.
+        """
+        if not count:
+            return None
+        target = fraction * count
+        seen = 0
+        for bucket, bucket_count in enumerate(histogram):
+            seen += bucket_count
+            if seen >= target:
+                return bucket / 2
+        return (len(histogram) - 1) / 2
+
+    def summary(self, job_title: str = ALL_JOB_TITLES) -> Dict[str, Any]:
+        """Per-dimension count, mean, standard deviation, histogram and percentiles for one job title."""
+        conn = self._connect()
+        stats = {
+            dimension: (count, total, total_sq) for dimension, count, total, total_sq in conn.execute(
+                "SELECT dimension, count, total, total_sq FROM analytics_stats WHERE job_title = ?", (job_title,)
+            )
+        }
+        histograms = {dimension: [0] * HISTOGRAM_BUCKETS for dimension in SCORE_DIMENSIONS}
+        for dimension, bucket, count in conn.execute(
+            "SELECT dimension, bucket, count FROM analytics_histogram WHERE job_title = ?", (job_title,)
+        ):
+            if dimension in histograms:
+                histograms[dimension][bucket] = count
+
+        dimensions = {}
+        for dimension in SCORE_DIMENSIONS:
+            count, total, total_sq = stats.get(dimension, (0, 0.0, 0.0))
+            mean = total / count if count else None
+            variance = max(total_sq / count - mean * mean, 0.0) if count else None
+            histogram = histograms[dimension]
+            dimensions[dimension] = {
+                "count": count,
+                "mean": round(mean, 2) if mean is not None else None,
+                "stddev": round(variance ** 0.5, 2) if variance is not None else None,
+                "histogram": {f"{bucket / 2:.1f}": n for bucket, n in enumerate(histogram) if n},
+                "percentiles": {
+                    f"p{int(fraction * 100)}": self._percentile(histogram, count, fraction)
+                    for fraction in (0.25, 0.5, 0.75, 0.9)
+                }
+            }
+        return {"job_title": job_title, "dimensions": dimensions}
+
+    def job_titles(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Job titles with the most interviews, with their mean overall score."""
+        rows = self._connect().execute(
+            "SELECT job_title, count, total FROM analytics_stats "
+            "WHERE dimension = 'overall' AND job_title != ? AND count > 0 "
+            "ORDER BY count DESC, job_title LIMIT ?",
+            (ALL_JOB_TITLES, limit)
+        )
+        return [
+            {"job_title": job_title, "count": count, "mean_overall": round(total / count, 2)}
+            for job_title, count, total in rows
+        ]
+
 
 # Interview-specific storage
 class InterviewStorage:
@@ -121,6 +1042,15 @@ class InterviewStorage:
 
     def __init__(self, storage: SimpleStorage):
         self.storage = storage
+        self.sessions = SessionCache(
+            storage,
+            flush_interval=float(os.getenv("SESSION_FLUSH_INTERVAL", 5)),
+            max_entries=int(os.getenv("SESSION_CACHE_MAX_ENTRIES", 1000))
+        )
+        self.index = InterviewIndex(
+            os.getenv("INTERVIEW_INDEX_PATH", os.path.join(storage.base_dir, "index.sqlite3"))
+        )
+        self.analytics = InterviewAnalytics(self.index.db_path)
 
     def save_interview_result(self, user_id: str, interview_data: Dict[str, Any]) -> bool:
         try:
@@ -129,7 +1059,15 @@ class InterviewStorage:
                 interview_data['interview_id'] = str(uuid.uuid4())
             interview_data['completed_at'] = datetime.datetime.now(datetime.timezone.utc).isoformat()
             filename = f"interview_{interview_data['interview_id']}.json"
-            return self.storage.save_user_data(user_id, filename, interview_data)
+            if not self.storage.save_user_data(user_id, filename, interview_data):
+                return False
+            self.index.add(user_id, interview_data)
+            try:
+                self.analytics.record(user_id, interview_data)
+            except Exception as e:
+                # Statistics can be rebuilt; don't fail the save over them
+                print(f"Error updating interview analytics: {e}")
+            return True
         except Exception as e:
             print(f"Error saving interview result: {e}")
             return False
@@ -148,18 +1086,208 @@ class InterviewStorage:
         interviews.sort(key=lambda x: x.get('completed_at', ''), reverse=True)
         return interviews
 
+    def list_interview_summaries(self, user_id: str, limit: int, cursor: Optional[str] = None):
+        """
+        Return (summaries, next cursor or None) for one page of a user's
+        history, newest first. Users with results from before the index
+        existed are indexed on first access.
+        """
+        if not self.index.is_indexed(user_id):
+            self.index.backfill(user_id, self.list_user_interviews(user_id))
+        return self.index.page(user_id, limit, cursor)
+
     def save_interview_session(self, user_id: str, session_data: Dict[str, Any]) -> bool:
-        filename = f"session_{session_data.get('session_id', 'active')}.json"
-        return self.storage.save_user_data(user_id, filename, session_data)
+        return self.sessions.save(user_id, session_data)
 
     def get_interview_session(self, user_id: str, session_id: str = 'active') -> Optional[Dict[str, Any]]:
-        filename = f"session_{session_id}.json"
-        return self.storage.load_user_data(user_id, filename)
+        return self.sessions.get(user_id, session_id)
+
+    def update_interview_session(self, user_id: str, session_id: str,
+                                 make_patch: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Apply the patch returned by make_patch(session) under the session's lock,
+        so concurrent writers (answer submission, background scoring) don't lose
+        updates. See SessionCache for the patch format. Returns a shallow copy of
+        the updated session (nested values are shared and read-only), or None if
+        it doesn't exist or the update can't be logged.
+        """
+        return self.sessions.update(user_id, session_id, make_patch)
+
+    def flush_interview_session(self, user_id: str, session_id: str) -> bool:
+        """Write a session's pending updates to its snapshot now."""
+        return self.sessions.flush(user_id, session_id)
 
     def delete_interview_session(self, user_id: str, session_id: str = 'active') -> bool:
-        filename = f"session_{session_id}.json"
-        return self.storage.delete_user_data(user_id, filename)
+        return self.sessions.delete(user_id, session_id)
 
 
 # Global interview storage instance
-interview_storage = InterviewStorage(storage)
\ No newline at end of file
+interview_storage = InterviewStorage(storage)
+
+class UserStore:
+    """
+    Account store shared by every gunicorn worker.
+    Records live in an append-only JSON-lines log; each process keeps an
+    email -> user_id index and an id -> record map built by replaying it.
+    """
+
+    def __init__(self, log_path: Optional[str] = None):
+        if log_path is None:
+            log_path = os.getenv("USER_STORE_PATH", "/tmp/user_data/users.log")
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._email_index: Dict[str, str] = {}
+        self._offset = 0
+        self._checked_at = 0.0
+
+        # Metrics
+        self.lookups = 0
+        self.log_checks = 0
+        self.reloads = 0
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        self._refresh()
+
+    def _apply(self, record: Dict[str, Any]):
+        """Apply a single log record to the in-memory index."""
+        self._users[record['id']] = record
+        self._email_index[record['email']] = record['id']
+
+    @property
+    def version(self) -> int:
+        """Grows whenever records are replayed, so callers can invalidate anything derived from users."""
+        return self._offset
+
+    def _refresh(self, max_age: float = 0.0):
+        """
+        Replay any records appended to the log since the last read.
+        With max_age, skip the check if the log was checked that recently.
+        """
+        now = time.monotonic()
+        if max_age and now - self._checked_at < max_age:
+            return
+        self._checked_at = now
+        self.log_checks += 1
+        try:
+            if os.path.getsize(self.log_path) == self._offset:
+                return
+        except FileNotFoundError:
+            return
+
+        self.reloads += 1
+        with self._lock:
+            with open(self.log_path, 'rb') as f:
+                f.seek(self._offset)
+                for line in f:
+                    # A partially written tail is picked up on the next refresh
+                    if not line.endswith(b'\n'):
+                        break
+                    self._offset += len(line)
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError) as e:
+                        print(f"Skipping corrupt user record: {e}")
+
+    def get_by_id(self, user_id: str, max_age: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Look up a user. With max_age, a recently checked index is trusted
+        without touching the log; a miss always re-checks, so users
+        registered by another worker are still found.
+        """
+        self.lookups += 1
+        self._refresh(max_age)
+        user = self._users.get(user_id)
+        if user is None and max_age:
+            self._refresh()
+            user = self._users.get(user_id)
+        return user
+
+    def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        self._refresh()
+        user_id = self._email_index.get(email)
+        return self._users.get(user_id) if user_id else None
+
+    def add_user(self, user: Dict[str, Any]) -> bool:
+        """Append a new user. Returns False if the email is already taken."""
+        line = (json.dumps(user, ensure_ascii=False) + '\n').encode('utf-8')
+        with open(self.log_path, 'ab') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                # Another worker may have registered the same email meanwhile
+                self._refresh()
+                if user['email'] in self._email_index:
+                    return False
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        self._refresh()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "lookups": self.lookups,
+            "log_checks": self.log_checks,
+            "reloads": self.reloads
+        }
+
+
+# Global user store instance
+user_store = UserStore()
+
+
+def _init_scan_worker():
+    # SQLite connections can't be used across a fork; workers open their own
+    if isinstance(storage, SQLiteStorage):
+        storage._local = threading.local()
+
+
+def _scan_user_results(user_id: str) -> List[tuple]:
+    """Return the analytics contributions of one user's results. Runs in a pool worker."""
+    contributions = []
+    for name in storage.list_user_files(user_id):
+        if name.startswith('interview_'):
+            interview = storage.load_user_data(user_id, name)
+            if interview and 'interview_id' in interview:
+                job_title, scores = InterviewAnalytics.contribution(interview)
+                contributions.append((user_id, interview['interview_id'], job_title, scores))
+    return contributions
+
+
+def rebuild_analytics(workers: int) -> int:
+    """Recompute interview analytics from every stored result. Returns the number of results."""
+    contributions = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_scan_worker) as pool:
+        for user_contributions in pool.map(_scan_user_results, storage.list_users(), chunksize=16):
+            contributions.extend(user_contributions)
+    interview_storage.analytics.rebuild(contributions)
+    return len(contributions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate = commands.add_parser("migrate", help="Import file storage into the SQLite backend")
+    migrate.add_argument("--source", default=os.getenv("STORAGE_DIR", "/tmp/user_data"),
+                         help="File storage base directory")
+    migrate.add_argument("--db", default=os.getenv("STORAGE_DB_PATH", "/tmp/user_data/storage.sqlite3"),
+                         help="SQLite database to import into")
+    rebuild = commands.add_parser("rebuild-analytics", help="Recompute interview analytics from all results")
+    rebuild.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        total = migrate_to_sqlite(args.source, SQLiteStorage(args.db))
+        print(f"Imported {total} documents into {args.db}")
+    elif args.command == "rebuild-analytics":
+        total = rebuild_analytics(args.workers)
+        print(f"Rebuilt analytics from {total} interview results")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
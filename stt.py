@@ -0,0 +1,224 @@
+import os
+import re
+import time
+import uuid
+import base64
+import hashlib
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+# Segments larger than this are rejected before they reach Gemini
+STT_MAX_SEGMENT_BYTES = int(os.getenv("STT_MAX_SEGMENT_BYTES", 8 * 1024 * 1024))
+# Uploads spill from memory to a temp file past this size
+STT_SPOOL_MEMORY_BYTES = int(os.getenv("STT_SPOOL_MEMORY_BYTES", 1024 * 1024))
+# Unfinished streams are removed after this many seconds
+STT_STREAM_TTL = int(os.getenv("STT_STREAM_TTL", 3600))
+
+READ_SIZE = 64 * 1024
+# Multiple of 3 so each encoded block is padding-free and blocks concatenate
+B64_BLOCK_SIZE = 3 * 64 * 1024
+# Base64 characters decoded per block when hashing, a multiple of 4
+B64_DECODE_BLOCK_SIZE = 4 * 64 * 1024
+
+DATA_URL_PATTERN = re.compile(r'^data:([^;,]+)?(?:;[^,]*)?,')
+BASE64_PATTERN = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+WHITESPACE_PATTERN = re.compile(r'\s')
+
+
+class AudioTooLargeError(Exception):
+    """Raised when an audio upload exceeds STT_MAX_SEGMENT_BYTES."""
+
+
+class SegmentExistsError(Exception):
+    """Raised when a stream segment with the same index was already recorded."""
+
+
+def split_data_url(audio_data: str) -> Tuple[str, Optional[str]]:
+    """Strip a data: URL prefix, returning (base64 payload, mime type or None)."""
+    match = DATA_URL_PATTERN.match(audio_data)
+    if not match:
+        return audio_data, None
+    return audio_data[match.end():], match.group(1)
+
+
+def normalize_base64(audio_b64: str) -> str:
+    """
+    Drop line breaks and other whitespace and restore missing '=' padding,
+    so wrapped or unpadded payloads decode like canonical base64.
+    """
+    if WHITESPACE_PATTERN.search(audio_b64):
+        audio_b64 = WHITESPACE_PATTERN.sub('', audio_b64)
+    remainder = len(audio_b64) % 4
+    if remainder in (2, 3) and not audio_b64.endswith('='):
+        audio_b64 += '=' * (4 - remainder)
+    return audio_b64
+
+
+def is_base64(audio_b64: str) -> bool:
+    """
+    Cheap syntax check, so bad input is rejected without decoding it.
+    Expects a normalize_base64() result. Empty input is rejected: it
+    decodes to no audio.
+    """
+    return bool(audio_b64) and len(audio_b64) % 4 == 0 and BASE64_PATTERN.fullmatch(audio_b64) is not None
+
+
+def spool_stream(stream: BinaryIO, max_bytes: int = STT_MAX_SEGMENT_BYTES,
+                 memory_bytes: int = STT_SPOOL_MEMORY_BYTES) -> Tuple[BinaryIO, int]:
+    """
+    Copy a request body into a spooled temp file, READ_SIZE bytes at a time.
+    Returns the rewound file and its size.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=memory_bytes)
+    size = 0
+    while True:
+        block = stream.read(READ_SIZE)
+        if not block:
+            break
+        size += len(block)
+        if size > max_bytes:
+            spool.close()
+            raise AudioTooLargeError(f"Audio segment is larger than the {max_bytes} byte limit")
+        spool.write(block)
+    spool.seek(0)
+    return spool, size
+
+
+def b64encode_file(f: BinaryIO) -> str:
+    """Base64-encode a file block by block, without reading it into memory first."""
+    parts = []
+    while True:
+        block = f.read(B64_BLOCK_SIZE)
+        if not block:
+            break
+        parts.append(base64.b64encode(block).decode('ascii'))
+    return "".join(parts)
+
+
+def audio_digest(audio_data: Optional[bytes] = None, audio_b64: Optional[str] = None) -> str:
+    """
+    SHA-256 of the decoded audio, so the same clip hashes alike whether it
+    arrived as raw bytes or base64. Base64 is decoded block by block.
+    """
+    digest = hashlib.sha256()
+    if audio_b64 is None:
+        digest.update(audio_data)
+    else:
+        for start in range(0, len(audio_b64), B64_DECODE_BLOCK_SIZE):
+            digest.update(base64.b64decode(audio_b64[start:start + B64_DECODE_BLOCK_SIZE]))
+    return digest.hexdigest()
+
+
+class RequestTimer:
+    """Collects per-phase durations of a request for a Server-Timing header."""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={ms:.1f}" for name, ms in self.timings.items())
+
+
+class TranscriptStreams:
+    """
+    File-backed state for chunked speech-to-text uploads.
+    Each stream is a directory of per-segment transcripts, so consecutive
+    segments can be handled by different gunicorn workers.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None):
+        if base_dir is None:
+            base_dir = os.getenv("STT_SPOOL_DIR", "/tmp/stt_streams")
+        self.base_dir = base_dir
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _stream_dir(self, user_id: str, stream_id: str) -> Optional[str]:
+        # stream_id comes from the URL; only accept the UUIDs we issue
+        try:
+            stream_id = str(uuid.UUID(stream_id))
+        except ValueError:
+            return None
+        return os.path.join(self.base_dir, user_id, stream_id)
+
+    def _remove_expired(self, user_dir: str):
+        cutoff = time.time() - STT_STREAM_TTL
+        for name in os.listdir(user_dir):
+            path = os.path.join(user_dir, name)
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def create(self, user_id: str) -> str:
+        stream_id = str(uuid.uuid4())
+        user_dir = os.path.join(self.base_dir, user_id)
+        os.makedirs(user_dir, exist_ok=True)
+        self._remove_expired(user_dir)
+        os.makedirs(os.path.join(user_dir, stream_id))
+        return stream_id
+
+    def exists(self, user_id: str, stream_id: str) -> bool:
+        stream_dir = self._stream_dir(user_id, stream_id)
+        return stream_dir is not None and os.path.isdir(stream_dir)
+
+    def _segment_files(self, stream_dir: str) -> List[str]:
+        return sorted(f for f in os.listdir(stream_dir) if f.startswith('segment_'))
+
+    def _create_segment(self, stream_dir: str, seq: int) -> Optional[int]:
+        """Atomically claim a segment file; O_EXCL makes this safe across workers."""
+        try:
+            return os.open(os.path.join(stream_dir, f"segment_{seq:06d}.txt"),
+                           os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return None
+
+    def add_segment(self, user_id: str, stream_id: str, text: str,
+                    seq: Optional[int] = None) -> int:
+        """
+        Record a segment's transcript and return its sequence number.
+        Clients that upload segments concurrently should pass the segment's
+        own index as seq; without one, the next free index is used.
+        Raises SegmentExistsError if seq was already recorded.
+        """
+        stream_dir = self._stream_dir(user_id, stream_id)
+        if seq is not None:
+            fd = self._create_segment(stream_dir, seq)
+            if fd is None:
+                raise SegmentExistsError(f"Segment {seq} was already uploaded")
+        else:
+            seq = len(self._segment_files(stream_dir))
+            fd = self._create_segment(stream_dir, seq)
+            while fd is None:
+                seq += 1
+                fd = self._create_segment(stream_dir, seq)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return seq
+
+    def transcript(self, user_id: str, stream_id: str) -> str:
+        stream_dir = self._stream_dir(user_id, stream_id)
+        parts = []
+        for name in self._segment_files(stream_dir):
+            with open(os.path.join(stream_dir, name), 'r', encoding='utf-8') as f:
+                text = f.read()
+            if text:
+                parts.append(text)
+        return " ".join(parts)
+
+    def finish(self, user_id: str, stream_id: str) -> str:
+        """Return the full transcript and discard the stream."""
+        text = self.transcript(user_id, stream_id)
+        shutil.rmtree(self._stream_dir(user_id, stream_id), ignore_errors=True)
+        return text
+
+
+# Global transcript stream store
+transcript_streams = TranscriptStreams()
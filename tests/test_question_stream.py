@@ -0,0 +1,124 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import main
+
+
+def chunk(text=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=text))] if text is not None else []
+    x_groq = SimpleNamespace(usage=SimpleNamespace(total_tokens=usage)) if usage else None
+    return SimpleNamespace(choices=choices, x_groq=x_groq)
+
+
+# Lines are split mid-word, mid-number and across the newline itself
+FRAGMENTS = [
+    "Here are your questions:\n1. Tell me ab", "out your Flask work?\n",
+    "2", ". How did you scale Qdrant", "?", "\n", "- Describe a hard bug",
+    "\n\n3) Why this role?",
+]
+EXPECTED = [
+    "Tell me about your Flask work?",
+    "How did you scale Qdrant?",
+    "Describe a hard bug",
+    "Why this role?",
+]
+
+
+class FakeGroq:
+    """Stands in for the Groq client; records how far each stream was read."""
+
+    def __init__(self, fragments):
+        self.fragments = fragments
+        self.consumed = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        assert kwargs["stream"] is True
+        return self._stream()
+
+    def _stream(self):
+        for fragment in self.fragments:
+            self.consumed += 1
+            yield chunk(fragment)
+        yield chunk(usage=42)
+
+
+@pytest.fixture
+def fake_groq(monkeypatch):
+    fake = FakeGroq(FRAGMENTS)
+    monkeypatch.setattr(main, "client", fake)
+    monkeypatch.setattr(main, "get_resume_by_name", lambda name, max_chars=None: "Python, Flask, Qdrant")
+    monkeypatch.setattr(main.response_cache, "enabled_for", lambda endpoint: False)
+    return fake
+
+
+def test_iter_questions_handles_split_fragments():
+    assert list(main.iter_questions(FRAGMENTS)) == EXPECTED
+
+
+def test_iter_questions_yields_each_line_once_complete():
+    fragments = iter(FRAGMENTS)
+    questions = main.iter_questions(fragments)
+    assert next(questions) == EXPECTED[0]
+    # The first question needs only the first two fragments
+    assert next(fragments) == FRAGMENTS[2]
+
+
+def test_iter_questions_one_character_at_a_time():
+    assert list(main.iter_questions("".join(FRAGMENTS))) == EXPECTED
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_endpoint_emits_question_events(fake_groq):
+    response = main.app.test_client().post(
+        "/api/generate-questions/stream",
+        json={"name": "Alice", "job_title": "Backend Engineer", "num_questions": 3}
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+
+    events = parse_events(response.get_data(as_text=True))
+    assert events == [
+        ("question", {"index": 0, "question": EXPECTED[0]}),
+        ("question", {"index": 1, "question": EXPECTED[1]}),
+        ("question", {"index": 2, "question": EXPECTED[2]}),
+        ("done", {"total_questions": 3}),
+    ]
+    # The stream is read to the end even past num_questions, so it can be cached
+    assert fake_groq.consumed == len(FRAGMENTS)
+
+
+def test_stream_endpoint_sends_first_question_early(fake_groq):
+    response = main.app.test_client().post(
+        "/api/generate-questions/stream",
+        json={"name": "Alice", "job_title": "Backend Engineer"}
+    )
+    body = response.response
+    first = next(iter(body))
+    first = first.decode() if isinstance(first, bytes) else first
+    assert parse_events(first) == [("question", {"index": 0, "question": EXPECTED[0]})]
+    assert fake_groq.consumed == 2
+    response.close()
+
+
+def test_stream_endpoint_reports_groq_errors(fake_groq, monkeypatch):
+    def broken(**kwargs):
+        raise RuntimeError("rate limited")
+
+    monkeypatch.setattr(fake_groq.chat.completions, "create", broken)
+    response = main.app.test_client().post(
+        "/api/generate-questions/stream",
+        json={"name": "Alice", "job_title": "Backend Engineer"}
+    )
+    events = parse_events(response.get_data(as_text=True))
+    assert events[-1][0] == "error"
+    assert "rate limited" in events[-1][1]["error"]
@@ -0,0 +1,110 @@
+import io
+
+import pytest
+from qdrant_client import QdrantClient
+
+import main
+
+
+def make_pdf(lines):
+    """Build a minimal single-page PDF whose text is the given lines."""
+    content = "BT /F1 10 Tf 40 800 Td 12 TL " + " ".join(
+        "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") '" for line in lines
+    ) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+        "/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+    return out.getvalue()
+
+
+RESUME_PDF = make_pdf(
+    [f"Line {i}: built Python services, Qdrant search and Flask APIs." for i in range(60)]
+)
+
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    client = QdrantClient(":memory:")
+    monkeypatch.setattr(main, "qdrant_client", client)
+    main.initialize_qdrant()
+    main.resume_cache.clear()
+    return client
+
+
+def upload(client, name="Alice"):
+    return client.post(
+        "/api/upload-resume",
+        data={"name": name, "resume": (io.BytesIO(RESUME_PDF), "resume.pdf")},
+        content_type="multipart/form-data",
+    )
+
+
+def point_ids(qdrant):
+    points, _ = qdrant.scroll(main.COLLECTION_NAME, limit=10_000, with_payload=True)
+    return {str(point.id): point.payload for point in points}
+
+
+def test_repeated_upload_keeps_point_count_constant(qdrant):
+    client = main.app.test_client()
+
+    first = upload(client)
+    assert first.status_code == 200
+    chunks = first.get_json()["chunks_stored"]
+    assert chunks > 1
+    ids = set(point_ids(qdrant))
+
+    for _ in range(99):
+        response = upload(client)
+        assert response.status_code == 200
+        assert response.get_json()["chunks_stored"] == chunks
+
+    assert qdrant.count(main.COLLECTION_NAME).count == chunks
+    assert set(point_ids(qdrant)) == ids
+
+
+def test_switching_embedder_replaces_points(qdrant, monkeypatch):
+    client = main.app.test_client()
+    upload(client)
+    old_ids = set(point_ids(qdrant))
+
+    class OtherEmbedder(main.HashEmbedder):
+        name = "other"
+
+    monkeypatch.setattr(main, "embedder", OtherEmbedder())
+    upload(client)
+
+    points = point_ids(qdrant)
+    assert len(points) == len(old_ids)
+    assert not old_ids & set(points)
+    assert {payload["embedder"] for payload in points.values()} == {"other"}
+
+
+def test_cached_resume_is_revalidated_after_upload_elsewhere(qdrant, monkeypatch):
+    client = main.app.test_client()
+    upload(client)
+    assert "Line 0" in main.get_resume_by_name("Alice")
+
+    # Another worker stores different text; this process's entry survives
+    entry = main.resume_cache.get("alice")
+    main.store_resume_in_qdrant("Alice", "Rewritten resume text.")
+    main.resume_cache.set("alice", entry)
+
+    assert "Line 0" in main.get_resume_by_name("Alice")
+    monkeypatch.setattr(main, "RESUME_CACHE_CHECK_SECONDS", 0)
+    assert main.get_resume_by_name("Alice") == "Rewritten resume text."